@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+性能基准测试
+
+用法:
+    python benchmark.py stability [--sizes 10000,100000,1000000]
+    python benchmark.py store [--json-dir config/watch_dog_data]
+    python benchmark.py pages [--dirs 2025,releases,focus]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import utils
+import stability
+import watch_dog_store
+import generate_navigation
+
+
+def generate_watch_dog_data(total_records, object_count=2, interval_minutes=10):
+    """
+    生成与config/watch_dog_data结构一致的模拟监控数据
+    Args:
+        total_records: 所有对象合计的历史记录数
+        object_count: 监控对象数量
+        interval_minutes: 相邻两次检查的间隔
+    Returns:
+        dict: 与load_watch_dog_data返回值结构一致的数据
+    """
+    rng = random.Random(42)
+    per_object = total_records // object_count
+    end_time = datetime(2025, 9, 15, 8, 0, tzinfo=timezone.utc)
+    watch_dog_data = {}
+
+    for i in range(object_count):
+        object_id = f"obj_bench_{i}"
+        start_time = end_time - timedelta(minutes=interval_minutes * per_object)
+        history = []
+        for n in range(per_object):
+            record_time = start_time + timedelta(minutes=interval_minutes * n)
+            online = rng.random() > 0.01
+            history.append({
+                'timestamp': record_time.strftime('%Y-%m-%dT%H:%M:%S.') + f"{record_time.microsecond // 1000:03d}Z",
+                'status': 'online' if online else 'offline',
+                'checkMethod': 'http_check',
+                'details': 'HTTP检查成功，状态码: 200' if online else 'HTTP检查失败'
+            })
+        watch_dog_data[object_id] = {
+            'objectId': object_id,
+            'objectName': f"模拟对象{i}",
+            'lastUpdated': end_time.isoformat().replace('+00:00', 'Z'),
+            'totalRecords': per_object,
+            'history': history
+        }
+
+    return watch_dog_data
+
+
+def timed(func, *args):
+    """执行函数并返回(结果, 耗时秒数)，屏蔽函数内部的打印输出"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_stability(sizes):
+    """对比逐日扫描与索引引擎在不同历史规模下的耗时"""
+    end_date = datetime(2025, 9, 15)
+    start_date = datetime(2025, 7, 1)
+    days = (end_date - start_date).days + 1
+
+    print(f"📊 calculate_daily_stability 基准测试（窗口 {days} 天）")
+    print(f"{'记录数':>10} {'逐日扫描(s)':>14} {'索引引擎(s)':>14} {'numpy(s)':>10} {'加速比':>8}")
+
+    for size in sizes:
+        watch_dog_data = generate_watch_dog_data(size)
+        legacy_result, legacy_time = timed(utils.calculate_daily_stability, watch_dog_data, start_date, end_date)
+        indexed_result, indexed_time = timed(stability.calculate_daily_stability, watch_dog_data, start_date, end_date)
+
+        if legacy_result != indexed_result:
+            raise AssertionError(f"{size} 条记录时两种实现的输出不一致")
+
+        numpy_column = f"{'-':>10}"
+        if stability.np is not None:
+            numpy_result, numpy_time = timed(stability.calculate_stability_numpy, watch_dog_data, start_date, end_date)
+            if numpy_result != indexed_result:
+                raise AssertionError(f"{size} 条记录时numpy实现的输出不一致")
+            numpy_column = f"{numpy_time:>10.3f}"
+
+        print(f"{size:>10} {legacy_time:>14.3f} {indexed_time:>14.3f} {numpy_column} {legacy_time / indexed_time:>7.1f}x")
+
+
+# 在子进程中运行加载代码，分别测量耗时和峰值RSS（KB）
+LOADER_SCRIPT = """
+import json, os, resource, sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if os.path.exists('/proc/self/status'):
+    with open('/proc/self/status') as f:
+        peak_rss = next((int(line.split()[1]) for line in f if line.startswith('VmHWM:')), peak_rss)
+print(elapsed, peak_rss)
+"""
+
+JSON_LOADER_BODY = """
+checks = 0
+for name in sorted(os.listdir(sys.argv[1])):
+    if name.endswith('.json'):
+        with open(os.path.join(sys.argv[1], name), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        checks += sum(1 for r in data.get('history', []) if r.get('status') == 'online')
+"""
+
+STORE_LOADER_BODY = """
+import watch_dog_store
+checks = 0
+for columns in watch_dog_store.open_watch_dog_store(sys.argv[2]).values():
+    online_code = columns.status_code('online')
+    checks += sum(1 for code in columns.status_codes if code == online_code)
+"""
+
+EMPTY_LOADER_BODY = "pass"
+
+
+def run_loader(body, json_dir, store_dir):
+    """在独立进程中执行加载代码，返回(耗时秒数, 峰值RSS KB)"""
+    output = subprocess.run(
+        [sys.executable, '-c', LOADER_SCRIPT.format(body=body), json_dir, store_dir],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[-2]), int(output[-1])
+
+
+def bench_store(json_dir):
+    """对比json.load全量加载与列式内存映射加载的耗时和内存"""
+    with tempfile.TemporaryDirectory() as store_dir:
+        _, convert_time = timed(watch_dog_store.sync_watch_dog_store, json_dir, store_dir)
+        _, baseline_rss = run_loader(EMPTY_LOADER_BODY, json_dir, store_dir)
+        json_time, json_rss = run_loader(JSON_LOADER_BODY, json_dir, store_dir)
+        store_time, store_rss = run_loader(STORE_LOADER_BODY, json_dir, store_dir)
+
+    print(f"📊 监控数据加载基准测试: {json_dir}（一次性转换耗时 {convert_time:.3f}s）")
+    print(f"{'方式':>8} {'耗时(s)':>10} {'增量RSS(KB)':>12}")
+    print(f"{'JSON':>8} {json_time:>10.3f} {json_rss - baseline_rss:>12}")
+    print(f"{'列式存储':>8} {store_time:>10.3f} {store_rss - baseline_rss:>12}")
+
+
+def bench_pages(dirs):
+    """对比BeautifulSoup完整解析与流式提取器在真实页面上的耗时"""
+    print("📊 页面信息提取基准测试")
+    print(f"{'目录':>10} {'文件数':>8} {'大小(KB)':>10} {'BeautifulSoup(s)':>18} {'流式(s)':>10} {'加速比':>8}")
+
+    for directory in dirs:
+        html_files = sorted(glob.glob(os.path.join(directory, '**', '*.html'), recursive=True))
+        contents = []
+        for file_path in html_files:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                contents.append(f.read())
+
+        bs4_time = stream_time = 0.0
+        for file_path, content in zip(html_files, contents):
+            bs4_result, elapsed = timed(generate_navigation.parse_page_html_bs4, content)
+            bs4_time += elapsed
+            stream_result, elapsed = timed(generate_navigation.parse_page_html, content)
+            stream_time += elapsed
+            if bs4_result != stream_result:
+                raise AssertionError(f"两种提取方式的结果不一致: {file_path}")
+
+        total_kb = sum(len(content.encode('utf-8')) for content in contents) // 1024
+        speedup = f"{bs4_time / stream_time:>7.1f}x" if stream_time else f"{'-':>8}"
+        print(f"{directory:>10} {len(html_files):>8} {total_kb:>10} {bs4_time:>18.3f} {stream_time:>10.3f} {speedup}")
+
+
+def parse_sizes(value):
+    return [int(part) for part in value.split(',') if part.strip()]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='报告生成流程的性能基准测试')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stability_parser = subparsers.add_parser('stability', help='稳定性计算引擎')
+    stability_parser.add_argument('--sizes', type=parse_sizes, default=[10000, 100000, 1000000],
+                                  help='逗号分隔的历史记录总数')
+
+    store_parser = subparsers.add_parser('store', help='监控数据列式存储')
+    store_parser.add_argument('--json-dir', default=watch_dog_store.DEFAULT_JSON_DIR,
+                              help='监控JSON目录')
+
+    pages_parser = subparsers.add_parser('pages', help='导航页面信息提取')
+    pages_parser.add_argument('--dirs', type=lambda value: [part for part in value.split(',') if part.strip()],
+                              default=['2025', 'releases', 'focus'], help='逗号分隔的页面目录')
+
+    args = parser.parse_args()
+    if args.command == 'stability':
+        bench_stability(args.sizes)
+    elif args.command == 'store':
+        bench_store(args.json_dir)
+    elif args.command == 'pages':
+        bench_pages(args.dirs)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,28 @@
 
 import os
 import glob
+import argparse
+import hashlib
 import json
 import time
 import logging
 import requests
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import quote
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from output_stage import finalize_outputs, output_size, print_output_report
+from static_assets import localize_vendor_references, publish_static
+from search_index import (RELEASE_TEXT_INDEX_PATH, SEARCH_INDEX_PATH, build_release_text_index, build_search_index,
+                          release_text_tokens)
+from utils import precompressed_siblings_fresh, stream_download, write_precompressed
 
 # 加载环境变量（从当前目录）
 load_dotenv()
@@ -22,6 +34,63 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# NAS同步的并发下载数、请求超时（连接, 读取，秒）和失败重试次数
+NAS_SYNC_WORKERS = int(os.getenv('NAS_SYNC_WORKERS', 8))
+NAS_REQUEST_TIMEOUT = (5, 30)
+NAS_MAX_RETRIES = 3
+# NAS文件列表的分页大小
+NAS_LIST_PAGE_SIZE = 200
+
+# 页面元数据缓存：按路径记录文件的mtime/size和提取结果，文件未变化时不再重新解析
+PAGE_META_CACHE_PATH = os.getenv('PAGE_META_CACHE_PATH', '.cache/page_meta.json')
+PAGE_META_CACHE_VERSION = 3
+
+# 建立页面索引时跳过的目录（以.开头的目录也会跳过）
+INDEX_SKIP_DIRS = {'assets', 'static', 'templates', 'node_modules', '__pycache__'}
+
+# 导航页面的报告分类及其路径规则
+REPORT_PATH_PATTERNS = [
+    ('daily', re.compile(r'^([0-9]{4})/([0-9]{2})/([0-9]{2})/index\.html$')),
+    ('monthly', re.compile(r'^([0-9]{4})/([0-9]{2})/index\.html$')),
+    ('releases', re.compile(r'^releases/([^/]+)/index\.html$')),
+    ('focus', re.compile(r'^focus/([^/]+)/index\.html$')),
+]
+
+RELEASE_DATE_PATTERN = re.compile(r'<span class="info-label">发布日期</span>\s*<span class="info-value">(\d{4}年\d{1,2}月\d{1,2}日)</span>')
+
+# API数据中每次运行都会变化的时间字段，判断内容是否变化时忽略
+API_VOLATILE_KEYS = ('generated_at', 'scan_time')
+
+# 分页API的每页记录数和分片目录
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 20))
+API_SHARD_DIR = 'api/pages'
+
+# 页面类型在分片路径中使用的英文名
+PAGE_TYPE_SLUGS = {
+    '每日测试报告': 'daily',
+    '月度测试报告': 'monthly',
+    '版本发布报告': 'releases',
+    '专项测试报告': 'focus',
+    '主页': 'home',
+    '未知类型': 'other'
+}
+
+
+def page_type_slug(page_type):
+    """
+    页面类型在分片路径中使用的英文名；未登记的类型用类型名的短哈希，避免与其他类型的分片互相覆盖
+    Args:
+        page_type: 页面类型名称
+    Returns:
+        str: 路径中使用的英文名
+    """
+    if page_type in PAGE_TYPE_SLUGS:
+        return PAGE_TYPE_SLUGS[page_type]
+    return f"type-{hashlib.sha1(page_type.encode('utf-8')).hexdigest()[:8]}"
+
+# 页面扫描的并行进程数，1为单进程，0为CPU核数（可被--jobs参数覆盖）
+NAV_SCAN_JOBS = int(os.getenv('NAV_SCAN_JOBS', 1))
+
 class NASReleaseSync:
     """
     从NAS同步Release Notes到本地
@@ -31,56 +100,139 @@ class NASReleaseSync:
         self.nas_base_url = os.getenv('NAS_BASE_URL')
         self.nas_release_path = os.getenv('NAS_RELEASE_PATH', '/Local/Material/Release Notes')
         self.local_release_dir = os.getenv('LOCAL_RELEASE_DIR', 'releases')
+        # 同步清单: 版本号 -> NAS上的modified/size和本地内容的sha256，用于判断文件是否需要重新下载
+        self.manifest_path = os.path.join(self.local_release_dir, '.sync_manifest.json')
+        self.manifest_lock = threading.Lock()
         
         if not self.nas_token or not self.nas_base_url:
             logger.warning("缺少NAS配置，跳过NAS同步功能")
             self.enabled = False
         else:
             self.nas_base_url = self.nas_base_url.rstrip('/')
+            self.session = self.create_session()
             self.enabled = True
             logger.info(f"NAS同步已启用 - 路径: {self.nas_release_path}, 本地目录: {self.local_release_dir}")
     
+    def create_session(self):
+        """创建NAS同步共用的HTTP会话：keep-alive连接池，连接错误和5xx按指数退避重试"""
+        retry = Retry(
+            total=NAS_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # /api/fs/list和/api/fs/get虽然是POST，但都是只读查询，可以安全重试
+            allowed_methods=None,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=NAS_SYNC_WORKERS, pool_maxsize=NAS_SYNC_WORKERS, max_retries=retry)
+        session = requests.Session()
+        session.headers['Authorization'] = self.nas_token
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
     def list_nas_files(self):
         """获取NAS上的Release Notes文件列表"""
         if not self.enabled:
             return []
         
         try:
-            headers = {
-                'Authorization': self.nas_token,
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'path': self.nas_release_path,
-                'password': '',
-                'page': 1,
-                'per_page': 1000,
-                'refresh': False
-            }
-            
             list_url = f"{self.nas_base_url}/api/fs/list"
-            response = requests.post(list_url, headers=headers, json=data)
-            
-            if response.status_code != 200:
-                logger.error(f"获取NAS文件列表失败: {response.status_code}")
-                return []
+            files = []
+            page = 1
+            while True:
+                data = {
+                    'path': self.nas_release_path,
+                    'password': '',
+                    'page': page,
+                    'per_page': NAS_LIST_PAGE_SIZE,
+                    'refresh': False
+                }
+                response = self.session.post(list_url, json=data, timeout=NAS_REQUEST_TIMEOUT)
+                
+                if response.status_code != 200:
+                    logger.error(f"获取NAS文件列表失败: {response.status_code}")
+                    return []
+                
+                result = response.json()
+                if result.get('code') != 200:
+                    logger.error(f"获取NAS文件列表失败: {result.get('message', '未知错误')}")
+                    return []
+                
+                page_data = result.get('data') or {}
+                content = page_data.get('content') or []
+                files.extend(content)
+                # total为目录下的文件总数，取满或返回空页时结束翻页
+                if not content or len(files) >= page_data.get('total', 0):
+                    break
+                page += 1
             
-            result = response.json()
-            if result.get('code') != 200:
-                logger.error(f"获取NAS文件列表失败: {result.get('message', '未知错误')}")
-                return []
-            
-            files = result.get('data', {}).get('content', [])
             # 只获取HTML文件
             html_files = [f for f in files if f.get('name', '').endswith('.html')]
-            logger.info(f"NAS上找到 {len(html_files)} 个Release HTML文件")
+            logger.info(f"NAS上找到 {len(html_files)} 个Release HTML文件（共 {page} 页）")
             return html_files
             
         except Exception as e:
             logger.error(f"获取NAS文件列表失败: {str(e)}")
             return []
     
+    def load_manifest(self):
+        """读取同步清单，不存在或损坏时返回空清单"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"同步清单损坏，重新建立: {e}")
+            return {}
+    
+    def save_manifest(self, manifest):
+        """原子写入同步清单"""
+        with self.manifest_lock:
+            os.makedirs(self.local_release_dir, exist_ok=True)
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+    
+    def file_hash(self, file_path):
+        """计算本地文件的sha256"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def needs_download(self, version, file_info, manifest, local_versions):
+        """
+        判断版本是否需要下载
+        Args:
+            version: 版本号
+            file_info: NAS文件信息
+            manifest: 同步清单
+            local_versions: 本地已有的版本号
+        Returns:
+            str: 需要下载的原因，无需下载时返回None
+        """
+        if version not in local_versions:
+            return "新版本"
+        
+        entry = manifest.get(version)
+        if entry is None:
+            # 清单建立之前已下载的版本：以当前NAS信息为基线登记，不重复下载
+            local_path = os.path.join(self.local_release_dir, version, 'index.html')
+            manifest[version] = {
+                'name': file_info.get('name'),
+                'modified': file_info.get('modified'),
+                'size': file_info.get('size'),
+                'sha256': self.file_hash(local_path)
+            }
+            return None
+        
+        if entry.get('modified') != file_info.get('modified') or entry.get('size') != file_info.get('size'):
+            return "NAS上已更新"
+        return None
+    
     def get_local_versions(self):
         """获取本地已有的版本号"""
         if not os.path.exists(self.local_release_dir):
@@ -105,23 +257,26 @@ class NASReleaseSync:
             return version
         return None
     
-    def download_file(self, file_info):
-        """从NAS下载文件"""
+    def download_file(self, file_info, local_path):
+        """
+        从NAS流式下载文件到本地路径（先写临时文件，完成后原子替换）
+        Args:
+            file_info: NAS文件信息
+            local_path: 本地保存路径
+        Returns:
+            tuple: (sha256, 文件大小)，失败时返回None
+        """
         try:
             filename = file_info.get('name')
             file_path = f"{self.nas_release_path}/{filename}"
             
-            headers = {
-                'Authorization': self.nas_token
-            }
-            
             # 获取文件下载链接
             get_data = {
                 'path': file_path
             }
             
             get_url = f"{self.nas_base_url}/api/fs/get"
-            response = requests.post(get_url, headers={'Authorization': self.nas_token, 'Content-Type': 'application/json'}, json=get_data)
+            response = self.session.post(get_url, json=get_data, timeout=NAS_REQUEST_TIMEOUT)
             
             if response.status_code != 200:
                 logger.error(f"获取文件信息失败: {filename}")
@@ -138,37 +293,20 @@ class NASReleaseSync:
                 return None
             
             # 下载文件
-            download_response = requests.get(raw_url, headers=headers)
-            if download_response.status_code != 200:
-                logger.error(f"下载文件失败: {filename}")
-                return None
+            with self.session.get(raw_url, stream=True, timeout=NAS_REQUEST_TIMEOUT) as download_response:
+                if download_response.status_code != 200:
+                    logger.error(f"下载文件失败: {filename}")
+                    return None
+                
+                sha256, size = stream_download(download_response, local_path)
             
-            return download_response.content
+            logger.info(f"已保存 {filename} 到 {local_path} ({size} 字节)")
+            return sha256, size
             
         except Exception as e:
             logger.error(f"下载文件失败 {file_info.get('name')}: {str(e)}")
             return None
     
-    def save_release_html(self, version, content):
-        """保存Release HTML到本地目录"""
-        try:
-            # 创建版本目录
-            version_dir = os.path.join(self.local_release_dir, version)
-            if not os.path.exists(version_dir):
-                os.makedirs(version_dir)
-            
-            # 保存为index.html
-            file_path = os.path.join(version_dir, 'index.html')
-            with open(file_path, 'wb') as f:
-                f.write(content)
-            
-            logger.info(f"已保存版本 {version} 到 {file_path}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"保存文件失败 {version}: {str(e)}")
-            return False
-    
     def sync_releases(self):
         """同步NAS上的Release Notes到本地"""
         if not self.enabled:
@@ -183,54 +321,242 @@ class NASReleaseSync:
             logger.info("NAS上没有找到Release文件")
             return 0
         
-        # 获取本地已有版本
+        # 获取本地已有版本和同步清单
         local_versions = self.get_local_versions()
+        manifest = self.load_manifest()
         
-        # 找出需要下载的新版本
-        new_versions = []
+        # 找出新增或在NAS上有更新的版本
+        pending_versions = []
         for file_info in nas_files:
             filename = file_info.get('name')
             version = self.extract_version_from_filename(filename)
+            if not version:
+                continue
             
-            if version and version not in local_versions:
-                new_versions.append((version, file_info))
+            reason = self.needs_download(version, file_info, manifest, local_versions)
+            if reason:
+                logger.info(f"版本 {version} 需要下载: {reason}")
+                pending_versions.append((version, file_info))
+        
+        self.save_manifest(manifest)
         
-        if not new_versions:
-            logger.info("没有新版本需要同步")
+        if not pending_versions:
+            logger.info("没有新版本或更新需要同步")
             return 0
         
-        logger.info(f"发现 {len(new_versions)} 个新版本需要下载")
+        logger.info(f"发现 {len(pending_versions)} 个版本需要下载（并发数 {NAS_SYNC_WORKERS}）")
         
-        # 下载新版本
+        # 并发下载，每完成一个文件立即写入清单，中断后重新运行只会下载剩余的文件
+        sync_start = time.perf_counter()
         downloaded_count = 0
-        for version, file_info in new_versions:
-            logger.info(f"正在下载版本 {version}...")
-            content = self.download_file(file_info)
-            
-            if content:
-                if self.save_release_html(version, content):
-                    downloaded_count += 1
-                    logger.info(f"成功下载版本 {version}")
+        with ThreadPoolExecutor(max_workers=NAS_SYNC_WORKERS) as executor:
+            futures = {
+                executor.submit(self.download_version, version, file_info): (version, file_info)
+                for version, file_info in pending_versions
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                version, file_info = futures[future]
+                result, elapsed = future.result()
+                if not result:
+                    logger.error(f"[{done}/{len(pending_versions)}] 下载版本 {version} 失败 ({elapsed:.2f}s)")
+                    continue
+                
+                sha256, _ = result
+                previous = manifest.get(version)
+                if previous and previous.get('sha256') == sha256:
+                    logger.info(f"[{done}/{len(pending_versions)}] 版本 {version} 内容未变化 ({elapsed:.2f}s)")
                 else:
-                    logger.error(f"保存版本 {version} 失败")
-            else:
-                logger.error(f"下载版本 {version} 失败")
+                    downloaded_count += 1
+                    logger.info(f"[{done}/{len(pending_versions)}] 成功下载版本 {version} ({elapsed:.2f}s)")
+                
+                manifest[version] = {
+                    'name': file_info.get('name'),
+                    'modified': file_info.get('modified'),
+                    'size': file_info.get('size'),
+                    'sha256': sha256
+                }
+                self.save_manifest(manifest)
         
-        logger.info(f"同步完成，成功下载 {downloaded_count} 个新版本")
+        logger.info(f"同步完成，成功下载 {downloaded_count} 个新增或更新的版本，耗时 {time.perf_counter() - sync_start:.2f}s")
         return downloaded_count
+    
+    def download_version(self, version, file_info):
+        """下载单个版本的Release Note，返回(download_file的结果, 耗时秒数)"""
+        start = time.perf_counter()
+        local_path = os.path.join(self.local_release_dir, version, 'index.html')
+        result = self.download_file(file_info, local_path)
+        return result, time.perf_counter() - start
+
+
+# 统计卡片及其标签/数值元素的class匹配规则
+STAT_CARD_PATTERN = re.compile(r'stat-card|info-card')
+STAT_LABEL_PATTERN = re.compile(r'stat-label|info-label')
+STAT_VALUE_PATTERN = re.compile(r'stat-number|info-value')
+
+SCRIPT_OPEN_PATTERN = re.compile(r'<script\b[^>]*>', re.IGNORECASE)
+SCRIPT_CLOSE_PATTERN = re.compile(r'</script\s*>', re.IGNORECASE)
 
 
-def extract_html_page_info(file_path):
-    """从HTML文件中提取页面信息"""
+class PageInfoParser(HTMLParser):
+    """
+    单遍流式提取页面的title、第一个h1、meta描述和统计卡片的标签/数值，不构建DOM树
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.h1 = None
+        self.meta_description = None
+        self.cards = []
+        # 正在收集文本的元素，按开始顺序排列: {'tag', 'depth', 'parts', 'on_close'}
+        self._captures = []
+
+    def _capture(self, tag, on_close):
+        self._captures.append({'tag': tag, 'depth': 1, 'parts': [], 'on_close': on_close})
+
+    def handle_starttag(self, tag, attrs):
+        for capture in self._captures:
+            if capture['tag'] == tag:
+                capture['depth'] += 1
+
+        attrs = dict(attrs)
+        class_name = attrs.get('class') or ''
+
+        if tag == 'title' and self.title is None:
+            self.title = ''
+            self._capture(tag, lambda text: setattr(self, 'title', text))
+        elif tag == 'h1' and self.h1 is None:
+            self.h1 = ''
+            self._capture(tag, lambda text: setattr(self, 'h1', text))
+        elif tag == 'meta' and attrs.get('name') == 'description' and self.meta_description is None:
+            self.meta_description = attrs.get('content') or ''
+
+        if class_name:
+            # 与card.find()一致：取卡片内第一个匹配的标签/数值元素
+            for card in self.cards:
+                if not card['open']:
+                    continue
+                for key, pattern in (('label', STAT_LABEL_PATTERN), ('value', STAT_VALUE_PATTERN)):
+                    if card[key] is None and pattern.search(class_name):
+                        card[key] = ''
+                        self._capture(tag, lambda text, card=card, key=key: card.__setitem__(key, text))
+
+            if STAT_CARD_PATTERN.search(class_name):
+                card = {'open': True, 'label': None, 'value': None}
+                self.cards.append(card)
+                self._capture(tag, lambda text, card=card: card.__setitem__('open', False))
+
+    def handle_endtag(self, tag):
+        for i, capture in enumerate(self._captures):
+            if capture['tag'] == tag:
+                capture['depth'] -= 1
+                if capture['depth'] == 0:
+                    # 结束标签同时隐式关闭其内部未闭合的元素
+                    self._close_captures(i)
+                    return
+
+    def handle_data(self, data):
+        for capture in self._captures:
+            capture['parts'].append(data)
+
+    def _close_captures(self, start):
+        closing = self._captures[start:]
+        del self._captures[start:]
+        for capture in reversed(closing):
+            capture['on_close'](''.join(capture['parts']))
+
+    def close(self):
+        super().close()
+        self._close_captures(0)
+
+    def stats(self):
+        """按卡片在文档中的顺序返回 {标签: 数值}"""
+        stats = {}
+        for card in self.cards:
+            if card['label'] is not None and card['value'] is not None:
+                stats[card['label'].strip()] = card['value'].strip()
+        return stats
+
+
+def iter_html_without_scripts(content):
+    """按顺序产出HTML片段，跳过<script>标签体（内嵌的大段JSON/JS无需解析）"""
+    pos = 0
+    while True:
+        script_open = SCRIPT_OPEN_PATTERN.search(content, pos)
+        if not script_open:
+            yield content[pos:]
+            return
+        yield content[pos:script_open.end()]
+        script_close = SCRIPT_CLOSE_PATTERN.search(content, script_open.end())
+        if not script_close:
+            return
+        pos = script_close.start()
+
+
+def parse_page_html(content):
+    """
+    流式提取页面信息
+    Args:
+        content: HTML文本
+    Returns:
+        dict: title、h1、meta_description（不存在时为None）和stats
+    """
+    parser = PageInfoParser()
+    for chunk in iter_html_without_scripts(content):
+        parser.feed(chunk)
+    parser.close()
+    return {
+        'title': parser.title.strip() if parser.title is not None else None,
+        'h1': parser.h1.strip() if parser.h1 is not None else None,
+        'meta_description': parser.meta_description.strip() if parser.meta_description is not None else None,
+        'stats': parser.stats()
+    }
+
+
+def parse_page_html_bs4(content):
+    """使用BeautifulSoup完整解析提取页面信息（原实现，作为基准测试的对照），返回值同parse_page_html"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    title = soup.find('title')
+    h1_tag = soup.find('h1')
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+
+    stats = {}
+    stat_cards = soup.find_all(class_=STAT_CARD_PATTERN)
+    for card in stat_cards:
+        label_elem = card.find(class_=STAT_LABEL_PATTERN)
+        value_elem = card.find(class_=STAT_VALUE_PATTERN)
+        if label_elem and value_elem:
+            label = label_elem.get_text().strip()
+            value = value_elem.get_text().strip()
+            stats[label] = value
+
+    return {
+        'title': title.get_text().strip() if title else None,
+        'h1': h1_tag.get_text().strip() if h1_tag else None,
+        'meta_description': meta_desc.get('content', '').strip() if meta_desc else None,
+        'stats': stats
+    }
+
+
+def extract_html_page_info(file_path, content=None, file_stat=None):
+    """
+    从HTML文件中提取页面信息
+    Args:
+        file_path: HTML文件的相对路径
+        content: 已读取的文件内容，为None时读取文件
+        file_stat: 已获取的文件状态，为None时重新stat
+    Returns:
+        dict: 页面信息，失败时返回None
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if content is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
 
-        soup = BeautifulSoup(content, 'html.parser')
+        parsed = parse_page_html(content)
 
         # 获取页面标题
-        title = soup.find('title')
-        title_text = title.get_text().strip() if title else "未知标题"
+        title_text = parsed['title'] if parsed['title'] is not None else "未知标题"
 
         # 获取文件路径信息
         path_obj = Path(file_path)
@@ -287,28 +613,19 @@ def extract_html_page_info(file_path):
         # 如果没有描述信息，尝试从HTML内容中提取
         if not description:
             # 查找h1标签
-            h1_tag = soup.find('h1')
-            if h1_tag:
-                description = h1_tag.get_text().strip()
+            if parsed['h1'] is not None:
+                description = parsed['h1']
 
             # 查找meta描述
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                description = meta_desc.get('content', '').strip()
+            if parsed['meta_description'] is not None:
+                description = parsed['meta_description']
 
         # 提取关键统计信息
-        stats = {}
-        stat_cards = soup.find_all(class_=re.compile(r'stat-card|info-card'))
-        for card in stat_cards:
-            label_elem = card.find(class_=re.compile(r'stat-label|info-label'))
-            value_elem = card.find(class_=re.compile(r'stat-number|info-value'))
-            if label_elem and value_elem:
-                label = label_elem.get_text().strip()
-                value = value_elem.get_text().strip()
-                stats[label] = value
+        stats = parsed['stats']
 
         # 获取文件信息
-        file_stat = path_obj.stat()
+        if file_stat is None:
+            file_stat = path_obj.stat()
 
         return {
             'url': str(relative_path).replace('\\', '/'),
@@ -327,19 +644,190 @@ def extract_html_page_info(file_path):
         logger.error(f"提取HTML页面信息失败 {file_path}: {e}")
         return None
 
-def scan_all_html_pages():
-    """扫描所有HTML页面"""
-    pages_data = []
+def resolve_jobs(jobs):
+    """把并行进程数参数换算为实际进程数（0表示CPU核数）"""
+    if jobs is None:
+        jobs = NAV_SCAN_JOBS
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
 
-    # 查找所有HTML文件
-    html_files = glob.glob('**/*.html', recursive=True)
+def parallel_map(func, items, jobs=1):
+    """
+    对items逐个调用func，结果顺序与输入一致
+    Args:
+        func: 模块级函数（需可被pickle）
+        items: 输入列表
+        jobs: 进程数，大于1时使用进程池并按块分发任务
+    Returns:
+        list: func的返回值列表
+    """
+    if jobs <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+
+    jobs = min(jobs, len(items))
+    # 每个进程分到约4块，兼顾负载均衡和进程间通信开销
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+def load_page_meta_cache():
+    """读取页面元数据缓存，不存在、损坏或版本不一致时返回空缓存"""
+    try:
+        with open(PAGE_META_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == PAGE_META_CACHE_VERSION:
+            return cache.get('pages', {})
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"页面元数据缓存损坏，重新建立: {e}")
+    return {}
+
+def save_page_meta_cache(pages):
+    """原子写入页面元数据缓存"""
+    try:
+        os.makedirs(os.path.dirname(PAGE_META_CACHE_PATH) or '.', exist_ok=True)
+        tmp_path = f"{PAGE_META_CACHE_PATH}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PAGE_META_CACHE_VERSION, 'pages': pages}, f, ensure_ascii=False)
+        os.replace(tmp_path, PAGE_META_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"保存页面元数据缓存失败: {e}")
+
+def walk_html_files(root='.'):
+    """
+    用os.scandir遍历目录树，跳过隐藏目录和资源目录
+    Args:
+        root: 遍历的根目录
+    Returns:
+        list: [(以/分隔的相对路径, os.stat_result)]，同一目录内按名称排序
+    """
+    html_files = []
+    pending = [('', root)]
+    while pending:
+        prefix, directory = pending.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError as e:
+            logger.error(f"读取目录失败 {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            relative_path = f"{prefix}{entry.name}"
+            try:
+                if entry.is_dir():
+                    if entry.name not in INDEX_SKIP_DIRS:
+                        subdirs.append((f"{relative_path}/", entry.path))
+                elif entry.name.endswith('.html'):
+                    html_files.append((relative_path, entry.stat()))
+            except OSError as e:
+                logger.error(f"读取文件信息失败 {entry.path}: {e}")
+        pending.extend(reversed(subdirs))
+
+    return html_files
+
+def match_report_path(file_path):
+    """返回(报告分类, 路径匹配结果)，不属于导航报告时返回(None, None)"""
+    for category, pattern in REPORT_PATH_PATTERNS:
+        match = pattern.match(file_path)
+        if match:
+            return category, match
+    return None, None
+
+def index_html_file(item):
+    """
+    读取并解析单个HTML文件（内容只读取一次，同时供API数据和导航分类使用）
+    Args:
+        item: (相对路径, os.stat_result)
+    Returns:
+        dict: 页面索引条目 {'mtime', 'size', 'info', 'release_date', 'release_tokens'}
+    """
+    file_path, file_stat = item
+    info = None
+    release_date = None
+    release_tokens = None
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        info = extract_html_page_info(file_path, content, file_stat)
+        if match_report_path(file_path)[0] == 'releases':
+            # 查找发布日期模式
+            date_match = RELEASE_DATE_PATTERN.search(content)
+            if date_match:
+                release_date = date_match.group(1)
+            # 版本说明全文索引的正文词集合，与页面信息一起缓存
+            release_tokens = release_text_tokens(content)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.error(f"读取HTML文件失败 {file_path}: {e}")
+
+    return {
+        'mtime': file_stat.st_mtime,
+        'size': file_stat.st_size,
+        'info': info,
+        'release_date': release_date,
+        'release_tokens': release_tokens
+    }
+
+def build_page_index(jobs=None):
+    """
+    一次遍历建立全站页面索引，每个文件只stat一次，未变化的文件直接使用元数据缓存
+    Args:
+        jobs: 解析页面的并行进程数，默认取NAV_SCAN_JOBS
+    Returns:
+        dict: key为相对路径，value为页面索引条目，按遍历顺序排列
+    """
+    jobs = resolve_jobs(jobs)
+    html_files = walk_html_files()
 
     logger.info(f"找到 {len(html_files)} 个HTML文件")
 
-    for html_file in html_files:
-        page_info = extract_html_page_info(html_file)
-        if page_info:
-            pages_data.append(page_info)
+    cache = load_page_meta_cache()
+    page_index = {}
+    changed_files = []
+
+    for file_path, file_stat in html_files:
+        entry = cache.get(file_path)
+        if entry and entry['mtime'] == file_stat.st_mtime and entry['size'] == file_stat.st_size:
+            page_index[file_path] = entry
+        else:
+            page_index[file_path] = None
+            changed_files.append((file_path, file_stat))
+
+    hits = len(html_files) - len(changed_files)
+    for (file_path, _), entry in zip(changed_files, parallel_map(index_html_file, changed_files, jobs)):
+        page_index[file_path] = entry
+
+    # 解析失败的页面不写入缓存，下次运行重试；已删除的页面随之从缓存中移除
+    save_page_meta_cache({path: entry for path, entry in page_index.items() if entry['info']})
+    logger.info(f"页面元数据缓存: 命中 {hits} 个，重新解析 {len(changed_files)} 个（进程数 {jobs}）")
+
+    return page_index
+
+def update_page_index(page_index, file_path):
+    """重新索引本次运行中新写入的文件（如导航页index.html）"""
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        page_index.pop(file_path, None)
+        return
+    page_index[file_path] = index_html_file((file_path, file_stat))
+
+def scan_all_html_pages(page_index=None):
+    """
+    扫描所有HTML页面
+    Args:
+        page_index: build_page_index的结果，为None时重新建立
+    Returns:
+        list: 页面信息列表，按修改时间倒序
+    """
+    if page_index is None:
+        page_index = build_page_index()
+
+    pages_data = [entry['info'] for entry in page_index.values() if entry['info']]
 
     # 按修改时间排序（最新的在前）
     pages_data.sort(key=lambda x: x['modified_timestamp'], reverse=True)
@@ -374,35 +862,181 @@ def generate_api_data(pages_data):
         'generated_at': datetime.now().isoformat()
     }
 
+def page_month(page):
+    """返回页面所属月份YYYY-MM：优先取报告日期，没有时取文件修改时间"""
+    month_match = re.match(r'(\d{4})年(\d{1,2})月', page.get('date_info') or '')
+    if month_match:
+        return f"{month_match.group(1)}-{month_match.group(2).zfill(2)}"
+    return page['modified_time'][:7]
+
+def paginate_pages(pages, url_prefix, generated_at):
+    """
+    把页面列表按API_PAGE_SIZE切分为分页文件
+    Args:
+        pages: 页面列表（已排序）
+        url_prefix: 分页文件路径前缀，例如 api/pages/page
+        generated_at: 生成时间
+    Returns:
+        dict: 分页文件路径 -> 内容，没有页面时也生成一个空的第一页
+    """
+    page_count = max(1, (len(pages) + API_PAGE_SIZE - 1) // API_PAGE_SIZE)
+    shards = {}
+    for page_number in range(1, page_count + 1):
+        shards[f"{url_prefix}-{page_number}.json"] = {
+            'status': 'success',
+            'data': {
+                'page': page_number,
+                'per_page': API_PAGE_SIZE,
+                'page_count': page_count,
+                'total_pages': len(pages),
+                'pages': pages[(page_number - 1) * API_PAGE_SIZE:page_number * API_PAGE_SIZE]
+            },
+            'generated_at': generated_at
+        }
+    return shards
+
+def generate_api_shards(api_data):
+    """
+    生成分页和分片API：全部页面分页、按类型分页、按月份分片，以及描述所有分片的manifest
+    Args:
+        api_data: generate_api_data的结果
+    Returns:
+        dict: 文件路径 -> 内容
+    """
+    pages = api_data['data']['pages']
+    generated_at = api_data['generated_at']
+
+    shards = paginate_pages(pages, f"{API_SHARD_DIR}/page", generated_at)
+    manifest = {
+        'per_page': API_PAGE_SIZE,
+        'total_pages': len(pages),
+        'pages': list(shards),
+        'types': {},
+        'months': {}
+    }
+
+    for page_type, type_pages in api_data['data']['pages_by_type'].items():
+        slug = page_type_slug(page_type)
+        type_shards = paginate_pages(type_pages, f"{API_SHARD_DIR}/type/{slug}/page", generated_at)
+        shards.update(type_shards)
+        manifest['types'][slug] = {
+            'page_type': page_type,
+            'total_pages': len(type_pages),
+            'pages': list(type_shards)
+        }
+
+    pages_by_month = {}
+    for page in pages:
+        pages_by_month.setdefault(page_month(page), []).append(page)
+    for month in sorted(pages_by_month, reverse=True):
+        month_path = f"{API_SHARD_DIR}/month/{month}.json"
+        shards[month_path] = {
+            'status': 'success',
+            'data': {
+                'month': month,
+                'total_pages': len(pages_by_month[month]),
+                'pages': pages_by_month[month]
+            },
+            'generated_at': generated_at
+        }
+        manifest['months'][month] = {
+            'total_pages': len(pages_by_month[month]),
+            'url': month_path
+        }
+
+    shards[f"{API_SHARD_DIR}/manifest.json"] = {
+        'status': 'success',
+        'data': manifest,
+        'generated_at': generated_at
+    }
+    return shards
+
+def remove_stale_shards(shard_paths):
+    """删除分片目录中本次没有生成的文件（页数减少或类型/月份消失后留下的旧分片）"""
+    removed = 0
+    for root, _, filenames in os.walk(API_SHARD_DIR):
+        for filename in filenames:
+            file_path = os.path.join(root, filename).replace(os.sep, '/')
+            base_path = re.sub(r'\.(gz|br)$', '', file_path)
+            if base_path not in shard_paths:
+                os.remove(file_path)
+                removed += 1
+    return removed
+
+def save_api_shards(api_data):
+    """增量保存分页和分片API"""
+    shards = generate_api_shards(api_data)
+    written = sum(1 for path, data in shards.items() if write_api_file(path, data))
+    removed = remove_stale_shards(shards)
+    logger.info(f"  - {API_SHARD_DIR}/ (分页和分片，共 {len(shards)} 个文件，重写 {written} 个，删除旧分片 {removed} 个)")
+
+def strip_volatile_fields(value):
+    """递归去掉API数据中的时间字段，用于比较两次生成的内容是否一致"""
+    if isinstance(value, dict):
+        return {k: strip_volatile_fields(v) for k, v in value.items() if k not in API_VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [strip_volatile_fields(item) for item in value]
+    return value
+
+def dump_api_json(data):
+    """序列化为紧凑JSON"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def write_api_file(path, data):
+    """
+    增量写入API文件：内容（忽略时间字段）与现有文件一致时保持原文件不变
+    Args:
+        path: API文件路径
+        data: API数据
+    Returns:
+        bool: 是否重新写入
+    """
+    try:
+        with open(path, 'rb') as f:
+            existing_bytes = f.read()
+        existing = json.loads(existing_bytes)
+    except (OSError, ValueError):
+        existing_bytes, existing = None, None
+
+    if existing is not None and strip_volatile_fields(existing) == strip_volatile_fields(data):
+        # 数据没有变化：沿用原来的生成时间，格式和压缩副本都已是最新时跳过写入
+        payload = dump_api_json(existing)
+        if payload == existing_bytes and precompressed_siblings_fresh(path, len(payload)):
+            return False
+    else:
+        payload = dump_api_json(data)
+
+    write_precompressed(path, payload)
+    return True
+
+def diff_pages(old_pages, new_pages):
+    """按url比较两次的页面列表，返回(新增数, 更新数, 删除数)"""
+    old_by_url = {page['url']: page for page in old_pages}
+    new_by_url = {page['url']: page for page in new_pages}
+    added = sum(1 for url in new_by_url if url not in old_by_url)
+    removed = sum(1 for url in old_by_url if url not in new_by_url)
+    changed = sum(1 for url, page in new_by_url.items() if url in old_by_url and old_by_url[url] != page)
+    return added, changed, removed
+
+def load_previous_pages(path='api/pages.json'):
+    """读取上一次生成的页面列表，不存在时返回空列表"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('data', {}).get('pages', [])
+    except (OSError, ValueError, AttributeError):
+        return []
+
 def save_api_data(api_data):
-    """保存API数据到JSON文件"""
+    """增量保存API数据到JSON文件（紧凑格式，附带预压缩副本，只重写内容有变化的文件）"""
     try:
         # 创建api目录（如果不存在）
         api_dir = Path('api')
         api_dir.mkdir(exist_ok=True)
 
-        # 保存完整数据
-        with open('api/pages.json', 'w', encoding='utf-8') as f:
-            json.dump(api_data, f, ensure_ascii=False, indent=2)
+        added, changed, removed = diff_pages(load_previous_pages(), api_data['data']['pages'])
+        logger.info(f"页面变化: 新增 {added} 个，更新 {changed} 个，删除 {removed} 个")
 
-        # 保存按类型分组的数据
-        with open('api/pages_by_type.json', 'w', encoding='utf-8') as f:
-            json.dump({
-                'status': 'success',
-                'data': api_data['data']['pages_by_type'],
-                'stats': api_data['data']['stats'],
-                'generated_at': api_data['generated_at']
-            }, f, ensure_ascii=False, indent=2)
-
-        # 保存统计数据
-        with open('api/stats.json', 'w', encoding='utf-8') as f:
-            json.dump({
-                'status': 'success',
-                'data': api_data['data']['stats'],
-                'generated_at': api_data['generated_at']
-            }, f, ensure_ascii=False, indent=2)
-
-        # 保存过滤掉release note的数据
+        # 过滤掉release note的数据
         filtered_pages = [page for page in api_data['data']['pages']
                          if page['page_type'] != '版本发布报告']
 
@@ -417,34 +1051,62 @@ def save_api_data(api_data):
             'last_updated': max(page['modified_timestamp'] for page in filtered_pages) if filtered_pages else 0
         }
 
-        filtered_api_data = {
-            'status': 'success',
-            'data': {
-                'pages': filtered_pages,
-                'pages_by_type': filtered_pages_by_type,
-                'stats': filtered_stats
+        api_files = {
+            # 完整数据
+            'api/pages.json': api_data,
+            # 按类型分组的数据
+            'api/pages_by_type.json': {
+                'status': 'success',
+                'data': api_data['data']['pages_by_type'],
+                'stats': api_data['data']['stats'],
+                'generated_at': api_data['generated_at']
+            },
+            # 统计数据
+            'api/stats.json': {
+                'status': 'success',
+                'data': api_data['data']['stats'],
+                'generated_at': api_data['generated_at']
             },
-            'generated_at': api_data['generated_at']
+            # 过滤后的完整数据
+            'api/pages_no_releases.json': {
+                'status': 'success',
+                'data': {
+                    'pages': filtered_pages,
+                    'pages_by_type': filtered_pages_by_type,
+                    'stats': filtered_stats
+                },
+                'generated_at': api_data['generated_at']
+            }
         }
 
-        # 保存过滤后的完整数据
-        with open('api/pages_no_releases.json', 'w', encoding='utf-8') as f:
-            json.dump(filtered_api_data, f, ensure_ascii=False, indent=2)
+        descriptions = {
+            'api/pages.json': '所有页面信息',
+            'api/pages_by_type.json': '按类型分组',
+            'api/stats.json': '统计信息',
+            'api/pages_no_releases.json': '排除版本发布报告'
+        }
+
+        written = [path for path, data in api_files.items() if write_api_file(path, data)]
+
+        logger.info(f"API数据文件生成成功（重写 {len(written)} 个，未变化 {len(api_files) - len(written)} 个）:")
+        for path in api_files:
+            logger.info(f"  - {path} ({descriptions[path]}){'' if path in written else '，未变化'}")
 
-        logger.info("API数据文件生成成功:")
-        logger.info("  - api/pages.json (所有页面信息)")
-        logger.info("  - api/pages_by_type.json (按类型分组)")
-        logger.info("  - api/stats.json (统计信息)")
-        logger.info("  - api/pages_no_releases.json (排除版本发布报告)")
+        save_api_shards(api_data)
 
     except Exception as e:
         logger.error(f"保存API数据失败: {e}")
 
-def scan_reports():
+def scan_reports(page_index=None):
     """
     扫描所有报告文件
     返回分类的报告列表
+    Args:
+        page_index: build_page_index的结果，为None时重新建立
     """
+    if page_index is None:
+        page_index = build_page_index()
+
     reports = {
         'daily': [],      # 每日报告
         'monthly': [],    # 每月精选
@@ -452,12 +1114,12 @@ def scan_reports():
         'focus': []       # 专项测试
     }
     
-    # 扫描每日报告 (YYYY/MM/DD/index.html)
-    daily_pattern = "[0-9][0-9][0-9][0-9]/[0-9][0-9]/[0-9][0-9]/index.html"
-    for file_path in glob.glob(daily_pattern):
-        date_parts = file_path.split('/')
-        if len(date_parts) >= 4:
-            year, month, day = date_parts[0], date_parts[1], date_parts[2]
+    for file_path, entry in page_index.items():
+        category, match = match_report_path(file_path)
+        
+        if category == 'daily':
+            # 每日报告 (YYYY/MM/DD/index.html)
+            year, month, day = match.groups()
             reports['daily'].append({
                 'path': file_path,
                 'year': year,
@@ -466,13 +1128,10 @@ def scan_reports():
                 'date': f"{year}-{month}-{day}",
                 'title': f"{year}年{month}月{day}日 测试日报"
             })
-    
-    # 扫描月度精选报告 (YYYY/MM/index.html)
-    monthly_pattern = "[0-9][0-9][0-9][0-9]/[0-9][0-9]/index.html"
-    for file_path in glob.glob(monthly_pattern):
-        date_parts = file_path.split('/')
-        if len(date_parts) == 3:  # 确保是月度报告，不是日报
-            year, month = date_parts[0], date_parts[1]
+        
+        elif category == 'monthly':
+            # 月度精选报告 (YYYY/MM/index.html)
+            year, month = match.groups()
             reports['monthly'].append({
                 'path': file_path,
                 'year': year,
@@ -480,40 +1139,21 @@ def scan_reports():
                 'date': f"{year}-{month}",
                 'title': f"{year}年{month}月 测试月报精选"
             })
-    
-    # 扫描发布说明 (releases/*/index.html)
-    releases_pattern = "releases/*/index.html"
-    for file_path in glob.glob(releases_pattern):
-        parts = file_path.split('/')
-        if len(parts) >= 3:
-            version = parts[1]
-            
-            # 尝试从HTML文件中提取发布日期
-            release_date = None
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # 查找发布日期模式
-                    import re
-                    date_match = re.search(r'<span class="info-label">发布日期</span>\s*<span class="info-value">(\d{4}年\d{1,2}月\d{1,2}日)</span>', content)
-                    if date_match:
-                        release_date = date_match.group(1)
-            except:
-                pass
-            
+        
+        elif category == 'releases':
+            # 发布说明 (releases/*/index.html)，发布日期在建立索引时已从HTML中提取
+            version = match.group(1)
             reports['releases'].append({
                 'path': file_path,
                 'version': version,
                 'title': f"Release {version}",
-                'release_date': release_date
+                'release_date': entry['release_date'],
+                'tokens': entry['release_tokens'] or []
             })
-    
-    # 扫描专项测试报告 (focus/*/index.html)
-    focus_pattern = "focus/*/index.html"
-    for file_path in glob.glob(focus_pattern):
-        parts = file_path.split('/')
-        if len(parts) >= 3:
-            project = parts[1]
+        
+        elif category == 'focus':
+            # 专项测试报告 (focus/*/index.html)
+            project = match.group(1)
             # 将项目名转换为更友好的标题
             project_title = project.replace('_', ' ').replace('-', ' ').title()
             reports['focus'].append({
@@ -573,258 +1213,21 @@ def generate_navigation_html(reports):
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>测试报告中心</title>
-    <style>
-        :root {{
-            --primary-color: #FFD700;
-            --secondary-color: #FFDF4F;
-            --accent-color: #ff6b6b;
-            --text-color: #333;
-            --text-secondary: #666;
-            --bg-color: #f5f7fa;
-            --card-bg: #ffffff;
-            --border-color: #e0e0e0;
-            --shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-            --hover-shadow: 0 4px 16px rgba(0, 0, 0, 0.15);
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: var(--text-color);
-            background: linear-gradient(135deg, #f5f7fa 0%, #f7f9fc 100%);
-            min-height: 100vh;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-
-        header {{
-            background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%);
-            color: white;
-            padding: 40px 0;
-            text-align: center;
-            border-radius: 16px;
-            margin-bottom: 40px;
-            box-shadow: var(--shadow);
-        }}
-
-        h1 {{
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin-bottom: 10px;
-            text-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }}
-
-        .subtitle {{
-            font-size: 1.1rem;
-            opacity: 0.95;
-        }}
-
-        .hero-section {{
-            margin-bottom: 50px;
-        }}
-
-        .latest-report {{
-            background: var(--card-bg);
-            border-radius: 12px;
-            padding: 30px;
-            box-shadow: var(--shadow);
-            margin-bottom: 40px;
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .latest-report::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 4px;
-            background: linear-gradient(90deg, var(--primary-color) 0%, var(--secondary-color) 100%);
-        }}
-
-        .latest-report h2 {{
-            color: var(--text-color);
-            margin-bottom: 15px;
-            font-size: 1.5rem;
-        }}
-
-        .latest-report-link {{
-            display: inline-block;
-            background: var(--primary-color);
-            color: white;
-            padding: 12px 24px;
-            border-radius: 8px;
-            text-decoration: none;
-            font-weight: 500;
-            transition: all 0.3s ease;
-            margin-top: 15px;
-        }}
-
-        .latest-report-link:hover {{
-            background: var(--secondary-color);
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(255, 215, 0, 0.3);
-        }}
-
-        .section {{
-            margin-bottom: 40px;
-        }}
-
-        .section-header {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 20px;
-            padding-bottom: 10px;
-            border-bottom: 2px solid var(--border-color);
-        }}
-
-        .section-icon {{
-            width: 40px;
-            height: 40px;
-            background: var(--primary-color);
-            border-radius: 8px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-right: 15px;
-            font-size: 1.5rem;
-        }}
-
-        .section h2 {{
-            color: var(--text-color);
-            font-size: 1.8rem;
-            font-weight: 600;
-        }}
-
-        .report-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-            gap: 20px;
-        }}
-
-        .report-card {{
-            background: var(--card-bg);
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: var(--shadow);
-            transition: all 0.3s ease;
-            cursor: pointer;
-            text-decoration: none;
-            color: var(--text-color);
-            display: block;
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .report-card::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 4px;
-            height: 100%;
-            background: var(--primary-color);
-            transform: scaleY(0);
-            transition: transform 0.3s ease;
-        }}
-
-        .report-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: var(--hover-shadow);
-        }}
-
-        .report-card:hover::before {{
-            transform: scaleY(1);
-        }}
-
-        .report-title {{
-            font-size: 1.1rem;
-            font-weight: 600;
-            margin-bottom: 8px;
-            color: var(--text-color);
-        }}
-
-        .report-meta {{
-            font-size: 0.9rem;
-            color: var(--text-secondary);
-        }}
-
-        .empty-state {{
-            text-align: center;
-            padding: 40px;
-            color: var(--text-secondary);
-        }}
-
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }}
-
-        .stat-card {{
-            background: var(--card-bg);
-            border-radius: 10px;
-            padding: 20px;
-            text-align: center;
-            box-shadow: var(--shadow);
-        }}
-
-        .stat-number {{
-            font-size: 2rem;
-            font-weight: 700;
-            color: var(--primary-color);
-        }}
-
-        .stat-label {{
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-            margin-top: 5px;
-        }}
-
-        footer {{
-            text-align: center;
-            padding: 40px 0 20px;
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }}
-
-        @media (max-width: 768px) {{
-            .container {{
-                padding: 10px;
-            }}
-
-            h1 {{
-                font-size: 2rem;
-            }}
-
-            .report-grid {{
-                grid-template-columns: 1fr;
-            }}
-
-            .stats {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{publish_static('navigation.css')}">
 </head>
 <body>
     <div class="container">
         <header>
             <h1>测试报告中心</h1>
+            <div class="search-box">
+                <input type="search" id="search-input" class="search-input" placeholder="搜索日报、版本号、专项测试..." autocomplete="off"
+                       data-search-index="{SEARCH_INDEX_PATH}" data-release-index="{RELEASE_TEXT_INDEX_PATH}">
+            </div>
         </header>
 
+        <!-- 搜索结果 -->
+        <div id="search-results" class="search-results"></div>
+
         <!-- 统计信息 -->
         <div class="stats">
             <div class="stat-card">
@@ -890,6 +1293,7 @@ def generate_navigation_html(reports):
             <p>Powered by 测试工具箱</p>
         </footer>
     </div>
+    <script src="{publish_static('navigation.js')}"></script>
 </body>
 </html>'''
     
@@ -949,6 +1353,12 @@ def generate_report_cards(reports):
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='生成导航页面和API数据')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='页面扫描的并行进程数，0为CPU核数（默认取环境变量NAV_SCAN_JOBS，未设置时为1）')
+    args = parser.parse_args()
+    jobs = resolve_jobs(args.jobs)
+
     try:
         print("🚀 开始生成导航页面和API数据...")
 
@@ -961,8 +1371,27 @@ def main():
         except Exception as e:
             print(f"⚠️ NAS同步失败（继续生成导航页面）: {e}")
 
+        # 专项测试页面引用的第三方库（如Chart.js）改为引用static/vendor下的本地副本
+        for focus_page in glob.glob('focus/*/index.html'):
+            if localize_vendor_references(focus_page):
+                print(f"📦 已本地化第三方库引用: {focus_page}")
+
+        # 一次遍历建立页面索引，导航分类和API数据都从该索引派生
+        page_index = build_page_index(jobs)
+
         # 扫描所有报告（用于导航页面生成）
-        reports = scan_reports()
+        reports = scan_reports(page_index)
+
+        # 生成客户端搜索使用的倒排索引
+        search_index = build_search_index(scan_all_html_pages(page_index))
+        write_api_file(SEARCH_INDEX_PATH, search_index)
+        print(f"🔍 搜索索引: {len(search_index['docs'])} 个页面，{len(search_index['terms'])} 个词条")
+
+        # 版本说明全文索引（正文分词结果在建立页面索引时随页面元数据缓存）
+        release_text_index = build_release_text_index(reports['releases'])
+        write_api_file(RELEASE_TEXT_INDEX_PATH, release_text_index)
+        print(f"🔍 版本说明全文索引: {len(release_text_index['releases'])} 个版本，"
+              f"{len(release_text_index['terms'])} 个词条")
 
         print(f"📊 报告扫描结果:")
         print(f"  - 日报: {len(reports['daily'])} 份")
@@ -980,9 +1409,13 @@ def main():
         print(f"\n✅ 导航页面生成完成!")
         print(f"📄 文件路径: index.html")
 
+        # 输出阶段：压缩导航页并生成预压缩副本（API文件写入时已是紧凑格式并带副本）
+        finalize_outputs(['index.html', publish_static('navigation.css'), publish_static('navigation.js')])
+
         # 扫描所有HTML页面（用于API数据生成）
         print(f"\n🔍 开始扫描所有HTML页面...")
-        all_pages = scan_all_html_pages()
+        update_page_index(page_index, 'index.html')
+        all_pages = scan_all_html_pages(page_index)
 
         print(f"📊 HTML页面扫描结果:")
         print(f"  - 总页面数: {len(all_pages)}")
@@ -1000,6 +1433,12 @@ def main():
         print(f"\n📝 生成API数据文件...")
         api_data = generate_api_data(all_pages)
         save_api_data(api_data)
+        print_output_report([
+            output_size(path) for path in
+            ['api/pages.json', 'api/pages_by_type.json', 'api/stats.json', 'api/pages_no_releases.json',
+             SEARCH_INDEX_PATH, RELEASE_TEXT_INDEX_PATH]
+            if os.path.exists(path)
+        ])
 
         print(f"\n✅ 所有任务完成!")
         print(f"🕐 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -1009,6 +1448,9 @@ def main():
         print(f"  - api/pages_by_type.json (按类型分组)")
         print(f"  - api/stats.json (统计信息)")
         print(f"  - api/pages_no_releases.json (排除版本发布报告)")
+        print(f"  - {API_SHARD_DIR}/manifest.json (分页、按类型和按月份分片的索引)")
+        print(f"  - {SEARCH_INDEX_PATH} (客户端搜索索引)")
+        print(f"  - {RELEASE_TEXT_INDEX_PATH} (版本说明全文索引)")
 
     except Exception as e:
         print(f"❌ 生成过程中发生错误: {e}")
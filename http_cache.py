@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+持久化的HTTP条件请求缓存：按URL记录ETag/Last-Modified和内容哈希，
+上游内容未变化（304）时直接复用本地缓存副本，不再重复传输
+"""
+
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+
+DEFAULT_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.cache/http')
+
+
+class HTTPCache:
+    """
+    URL -> {etag, last_modified, sha256, size} 的缓存索引，内容按sha256存放在blobs目录
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.blobs_dir = os.path.join(cache_dir, 'blobs')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.entries = self._load_index()
+        self.stats = {
+            'requests': 0,
+            'hits': 0,
+            'unchanged': 0,
+            'bytes_saved': 0,
+            'bytes_downloaded': 0
+        }
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ HTTP缓存索引损坏，重新建立: {e}")
+            return {}
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.blobs_dir, sha256)
+
+    def _cached_entry(self, url):
+        entry = self.entries.get(url)
+        if entry and os.path.exists(self._blob_path(entry['sha256'])):
+            return entry
+        return None
+
+    def conditional_headers(self, url):
+        """
+        生成条件请求头
+        Args:
+            url: 资源URL
+        Returns:
+            dict: If-None-Match / If-Modified-Since请求头，无缓存时为空
+        """
+        entry = self._cached_entry(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def link_to(self, url, local_path):
+        """
+        把URL的缓存副本链接（不支持硬链接时复制）到目标路径
+        Returns:
+            bool: 是否存在缓存副本
+        """
+        entry = self._cached_entry(url)
+        if not entry:
+            return False
+
+        os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+        if os.path.lexists(local_path):
+            os.remove(local_path)
+        try:
+            os.link(self._blob_path(entry['sha256']), local_path)
+        except OSError:
+            shutil.copyfile(self._blob_path(entry['sha256']), local_path)
+        return True
+
+    def forget(self, url):
+        """删除URL的缓存条目（缓存副本已丢失时调用），不再为它发送条件请求"""
+        with self.lock:
+            entry = self.entries.pop(url, None)
+            if entry:
+                self._remove_unreferenced_blob(entry['sha256'])
+
+    def record_not_modified(self, url):
+        """记录一次304命中，返回被复用的字节数"""
+        with self.lock:
+            entry = self.entries[url]
+            self.stats['requests'] += 1
+            self.stats['hits'] += 1
+            self.stats['bytes_saved'] += entry['size']
+            return entry['size']
+
+    def store_file(self, url, file_path, sha256, size, response_headers):
+        """
+        把一次完整下载的文件登记到缓存（硬链接进blobs目录，不支持时复制）
+        Args:
+            url: 资源URL
+            file_path: 已下载完成的文件路径
+            sha256: 文件内容的sha256
+            size: 文件大小
+            response_headers: 响应头
+        """
+        blob_path = self._blob_path(sha256)
+        if not os.path.exists(blob_path):
+            os.makedirs(self.blobs_dir, exist_ok=True)
+            tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            try:
+                os.link(file_path, tmp_path)
+            except OSError:
+                shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, blob_path)
+
+        with self.lock:
+            previous = self.entries.get(url)
+            self.stats['requests'] += 1
+            self.stats['bytes_downloaded'] += size
+            if previous and previous['sha256'] == sha256:
+                # 服务器不支持条件请求，但内容与上次一致
+                self.stats['unchanged'] += 1
+
+            self.entries[url] = {
+                'etag': response_headers.get('ETag'),
+                'last_modified': response_headers.get('Last-Modified'),
+                'sha256': sha256,
+                'size': size,
+                'fetched_at': datetime.now().isoformat()
+            }
+
+            if previous and previous['sha256'] != sha256:
+                self._remove_unreferenced_blob(previous['sha256'])
+
+    def _remove_unreferenced_blob(self, sha256):
+        if any(entry['sha256'] == sha256 for entry in self.entries.values()):
+            return
+        try:
+            os.remove(self._blob_path(sha256))
+        except FileNotFoundError:
+            pass
+
+    def save(self):
+        """原子写入缓存索引"""
+        with self.lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.index_path)
+
+    def report(self):
+        """打印本次运行的缓存命中率和节省的流量"""
+        requests_count = self.stats['requests']
+        if requests_count == 0:
+            return
+        hit_rate = self.stats['hits'] / requests_count * 100
+        print(f"📦 HTTP缓存: 命中 {self.stats['hits']}/{requests_count} ({hit_rate:.0f}%)，"
+              f"节省 {self.stats['bytes_saved']} 字节，下载 {self.stats['bytes_downloaded']} 字节，"
+              f"内容未变但重新下载 {self.stats['unchanged']} 次")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+输出阶段：对生成的HTML/JSON/CSS做保守的压缩（不改变渲染结果），
+并为超过阈值的文件生成.gz/.br预压缩副本，最后打印每个文件的体积变化
+"""
+
+import os
+import re
+import json
+from utils import PRECOMPRESS_MIN_BYTES, precompressed_siblings_fresh, write_precompressed
+
+# 设置 MINIFY_OUTPUT=0 时保留原始格式，便于调试生成的页面
+MINIFY_OUTPUT = os.getenv('MINIFY_OUTPUT', '1') != '0'
+# 写入页面或资源文件的JSON序列化参数
+JSON_DUMP_OPTIONS = {'separators': (',', ':')} if MINIFY_OUTPUT else {'indent': 2}
+
+# 内容需要原样保留或单独处理的元素
+RAW_TEXT_PATTERN = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.IGNORECASE | re.DOTALL)
+HTML_COMMENT_PATTERN = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+JSON_SCRIPT_PATTERN = re.compile(r'type\s*=\s*["\']application/(ld\+)?json["\']', re.IGNORECASE)
+
+CSS_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_SPACE_AROUND_PATTERN = re.compile(r'\s*([{};,>])\s*')
+CSS_SPACE_AFTER_COLON_PATTERN = re.compile(r':\s+')
+
+
+def minify_css(css):
+    """
+    压缩CSS：去掉注释和多余空白，保留选择器中冒号前的空格（a :hover 与 a:hover 含义不同）
+    Args:
+        css: CSS文本
+    Returns:
+        str: 压缩后的CSS
+    """
+    css = CSS_COMMENT_PATTERN.sub('', css)
+    css = ' '.join(css.split())
+    css = CSS_SPACE_AROUND_PATTERN.sub(r'\1', css)
+    css = CSS_SPACE_AFTER_COLON_PATTERN.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def _collapse_whitespace(match):
+    # 含换行的空白折叠为一个换行，其余折叠为一个空格，两者在HTML中渲染效果相同
+    return '\n' if '\n' in match.group(0) else ' '
+
+
+def _minify_html_text(text):
+    text = HTML_COMMENT_PATTERN.sub('', text)
+    return re.sub(r'\s+', _collapse_whitespace, text)
+
+
+def minify_html(html):
+    """
+    压缩HTML：去掉注释和缩进，内联CSS和JSON同时压缩；
+    脚本、pre、textarea的内容原样保留
+    Args:
+        html: HTML文本
+    Returns:
+        str: 压缩后的HTML
+    """
+    parts = []
+    pos = 0
+    for match in RAW_TEXT_PATTERN.finditer(html):
+        parts.append(_minify_html_text(html[pos:match.start()]))
+        open_tag, tag, content, close_tag = match.group(1), match.group(2).lower(), match.group(3), match.group(4)
+        if tag == 'style':
+            content = minify_css(content)
+        elif tag == 'script' and JSON_SCRIPT_PATTERN.search(open_tag):
+            try:
+                # 保留</的转义，避免数据中的文本提前结束script标签
+                content = json.dumps(json.loads(content), ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+            except ValueError:
+                pass
+        parts.append(f"{_minify_html_text(open_tag)}{content}{close_tag}")
+        pos = match.end()
+    parts.append(_minify_html_text(html[pos:]))
+    return ''.join(parts).strip() + '\n'
+
+
+def minify_bytes(path, data):
+    """
+    按扩展名压缩文件内容，不支持的类型（如JS）原样返回
+    Args:
+        path: 文件路径
+        data: 文件内容（bytes）
+    Returns:
+        bytes: 压缩后的内容
+    """
+    if not MINIFY_OUTPUT:
+        return data
+
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == '.html':
+            return minify_html(data.decode('utf-8')).encode('utf-8')
+        if extension == '.css':
+            return minify_css(data.decode('utf-8')).encode('utf-8')
+        if extension == '.json':
+            return json.dumps(json.loads(data), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    except (UnicodeDecodeError, ValueError) as e:
+        print(f"⚠️ 压缩失败，保留原文件 {path}: {e}")
+    return data
+
+
+def output_size(path, original=None):
+    """
+    统计文件及其预压缩副本的字节数
+    Args:
+        path: 文件路径
+        original: 压缩前的字节数，默认与当前文件相同
+    Returns:
+        dict: {'path', 'original', 'minified', 'gz', 'br'}，不存在的副本为None
+    """
+    size = os.path.getsize(path)
+
+    def sibling_size(suffix):
+        sibling_path = f"{path}.{suffix}"
+        return os.path.getsize(sibling_path) if os.path.exists(sibling_path) else None
+
+    return {
+        'path': path,
+        'original': size if original is None else original,
+        'minified': size,
+        'gz': sibling_size('gz'),
+        'br': sibling_size('br')
+    }
+
+
+def finalize_outputs(paths, min_size=PRECOMPRESS_MIN_BYTES):
+    """
+    对生成的文件执行输出阶段：压缩内容并写入预压缩副本，内容和副本都已是最新时不重写
+    Args:
+        paths: 文件路径列表
+        min_size: 生成.gz/.br副本的最小字节数
+    Returns:
+        list: 每个文件的体积，见output_size
+    """
+    report = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            original = f.read()
+
+        minified = minify_bytes(path, original)
+        if minified != original or not precompressed_siblings_fresh(path, len(minified), min_size):
+            write_precompressed(path, minified, min_size)
+        report.append(output_size(path, len(original)))
+
+    print_output_report(report)
+    return report
+
+
+def print_output_report(report):
+    """打印每个文件压缩前后和预压缩副本的字节数"""
+    if not report:
+        return
+
+    def fmt(size):
+        return f"{size:>10}" if size is not None else f"{'-':>10}"
+
+    print(f"📊 输出文件体积（字节）:")
+    print(f"   {'文件':<40} {'原始':>10} {'压缩后':>10} {'gzip':>10} {'brotli':>10}")
+    for row in report:
+        print(f"   {row['path']:<42} {fmt(row['original'])} {fmt(row['minified'])} {fmt(row['gz'])} {fmt(row['br'])}")
+    total_original = sum(row['original'] for row in report)
+    total_served = sum(min(size for size in (row['minified'], row['gz'], row['br']) if size is not None) for row in report)
+    print(f"   合计 {total_original} → {total_served} 字节（按最小的可用副本计）")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+版本发布图：构建时计算版本节点布局（按日期定位、同日版本排开、防重叠、标签错开），
+直接输出SVG嵌入日报页面，浏览器端只负责提示框
+"""
+
+import re
+from bisect import bisect_right, insort
+from datetime import date
+from html import escape
+
+DIAGRAM_HEIGHT = 400
+DIAGRAM_MARGIN = {'top': 60, 'right': 80, 'bottom': 60, 'left': 50}
+# 时间轴右侧为主线箭头预留的宽度
+AXIS_RIGHT_PADDING = 50
+MAIN_Y = DIAGRAM_HEIGHT / 2
+BRANCH_Y = DIAGRAM_HEIGHT / 2 + 120
+BRANCH_ROW_SPACING = 60
+BRANCH_CORNER_RADIUS = 20
+NODE_RADIUS = 10
+# 相邻节点之间的最小距离，以及版本号标签需要错开的距离
+MIN_NODE_DISTANCE = 40
+MIN_LABEL_DISTANCE = 50
+MAX_SAME_DAY_SPACING = 100
+
+STORE_RELEASE_NOTE = '主线版本(商店发布)'
+BUILD_NUMBER_PATTERN = re.compile(r'\((\d+)\)')
+
+SVG_DEFS = (
+    '<defs>'
+    '<linearGradient id="mainGradient" x1="0%" x2="100%">'
+    '<stop offset="0%" stop-color="var(--main-color)" stop-opacity="0.8"></stop>'
+    '<stop offset="100%" stop-color="var(--main-color)" stop-opacity="0.6"></stop>'
+    '</linearGradient>'
+    '<marker id="arrowhead" markerWidth="10" markerHeight="7" refX="9" refY="3.5" orient="auto">'
+    '<polygon points="0 0, 10 3.5, 0 7" fill="var(--main-color)" opacity="0.8"></polygon>'
+    '</marker>'
+    '</defs>'
+)
+
+
+def build_number(version):
+    """提取版本号括号中的构建号，例如 1.0.15(181) -> 181，没有时为0"""
+    match = BUILD_NUMBER_PATTERN.search(version)
+    return int(match.group(1)) if match else 0
+
+
+def parse_release_date(value):
+    """解析YYYY-MM-DD格式的发布日期，无法解析时返回None"""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _fmt(value):
+    """坐标保留两位小数，去掉多余的0"""
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def layout_release_diagram(releases):
+    """
+    计算版本发布图的布局
+    Args:
+        releases: 版本列表，每项包含version、date、type、note
+    Returns:
+        dict: {'width', 'height', 'nodes': [按releases顺序的节点 {'index', 'x', 'y', 'label_y', 'node_class',
+              'label_class', 'label', 'date_label'}], 'main_path', 'branch_paths': [(path, merged)]}
+    """
+    releases = [release for release in releases if parse_release_date(release.get('date'))]
+    margin = DIAGRAM_MARGIN
+    width = max(1200, len(releases) * 100 + 100)
+    layout = {'width': width, 'height': DIAGRAM_HEIGHT, 'nodes': [], 'main_path': None, 'branch_paths': []}
+    if not releases:
+        return layout
+
+    dates = [parse_release_date(release['date']) for release in releases]
+    min_date = min(dates)
+    range_days = (max(dates) - min_date).days
+    span = width - margin['left'] - margin['right'] - AXIS_RIGHT_PADDING
+
+    def date_x(day):
+        if range_days == 0:
+            return margin['left']
+        return margin['left'] + (day - min_date).days / range_days * span
+
+    # 按日期定位；同一天的多个版本按构建号升序、以相邻天的间距（不超过100px）水平排开
+    groups = {}
+    for index, day in enumerate(dates):
+        groups.setdefault(day, []).append(index)
+
+    day_spacing = span / range_days if range_days > 0 else MAX_SAME_DAY_SPACING
+    spacing = min(day_spacing, MAX_SAME_DAY_SPACING)
+    positions = [0.0] * len(releases)
+    for day, indexes in groups.items():
+        base_x = date_x(day)
+        indexes.sort(key=lambda i: build_number(releases[i]['version']))
+        start_x = base_x - (len(indexes) - 1) * spacing / 2
+        for offset, index in enumerate(indexes):
+            positions[index] = start_x + offset * spacing
+
+    # 防重叠：按（日期, 构建号）顺序一次扫描，与前一个节点距离不足时向右推开
+    order = sorted(range(len(releases)), key=lambda i: (dates[i], build_number(releases[i]['version'])))
+    for prev, current in zip(order, order[1:]):
+        if positions[current] - positions[prev] < MIN_NODE_DISTANCE:
+            positions[current] = positions[prev] + MIN_NODE_DISTANCE
+
+    # 分支结构：按时间顺序，branch-start开启分支，branch-merge合并回主线
+    branches = []
+    main_indexes = []
+    current_branch = None
+    for index in sorted(range(len(releases)), key=lambda i: dates[i]):
+        release_type = releases[index].get('type')
+        if release_type == 'branch-start':
+            current_branch = {'start': index, 'members': [index], 'end': None}
+            main_indexes.append(index)
+        elif release_type == 'branch-merge':
+            if current_branch:
+                current_branch['end'] = index
+                current_branch['members'].append(index)
+                branches.append(current_branch)
+                current_branch = None
+            main_indexes.append(index)
+        elif release_type == 'branch':
+            if current_branch:
+                current_branch['members'].append(index)
+        else:
+            main_indexes.append(index)
+    if current_branch:
+        branches.append(current_branch)
+
+    if len(main_indexes) > 1:
+        extended_x = width - margin['right'] + 20
+        points = [positions[i] for i in main_indexes] + [extended_x]
+        layout['main_path'] = f"M {_fmt(points[0])} {_fmt(MAIN_Y)}" + ''.join(
+            f" L {_fmt(x)} {_fmt(MAIN_Y)}" for x in points[1:]
+        )
+
+    branch_of = {}
+    radius = BRANCH_CORNER_RADIUS
+    for branch_index, branch in enumerate(branches):
+        for index in branch['members']:
+            branch_of.setdefault(index, branch_index)
+        if len(branch['members']) < 2:
+            continue
+
+        branch_y = BRANCH_Y + branch_index * BRANCH_ROW_SPACING
+        start_x = positions[branch['start']]
+        path = [
+            f"M {_fmt(start_x)} {_fmt(MAIN_Y)}",
+            f"L {_fmt(start_x)} {_fmt(branch_y - radius)}",
+            f"Q {_fmt(start_x)} {_fmt(branch_y)}, {_fmt(start_x + radius)} {_fmt(branch_y)}"
+        ]
+        path.extend(f"L {_fmt(positions[i])} {_fmt(branch_y)}" for i in branch['members'][1:-1])
+        merged = branch['end'] is not None
+        if merged:
+            end_x = positions[branch['end']]
+            path.append(f"L {_fmt(end_x - radius)} {_fmt(branch_y)}")
+            path.append(f"Q {_fmt(end_x)} {_fmt(branch_y)}, {_fmt(end_x)} {_fmt(branch_y - radius)}")
+            path.append(f"L {_fmt(end_x)} {_fmt(MAIN_Y)}")
+        else:
+            path.append(f"L {_fmt(positions[branch['members'][-1]])} {_fmt(branch_y)}")
+        layout['branch_paths'].append((' '.join(path), merged))
+
+    # 版本号标签：与前面任一节点距离过近时按序号奇偶上下错开，已放置的横坐标保持有序，二分查找邻近节点
+    placed = []
+    for index, release in enumerate(releases):
+        x = positions[index]
+        y = MAIN_Y
+        if release.get('type') == 'branch':
+            y = BRANCH_Y + branch_of.get(index, 0) * BRANCH_ROW_SPACING
+
+        label_y = y - 20
+        nearest = bisect_right(placed, x - MIN_LABEL_DISTANCE)
+        if nearest < len(placed) and placed[nearest] < x + MIN_LABEL_DISTANCE:
+            label_y = y - 35 if index % 2 == 0 else y - 5
+        insort(placed, x)
+
+        node_class, label_class = 'main-node', 'node-label'
+        if STORE_RELEASE_NOTE in (release.get('note') or ''):
+            node_class, label_class = 'store-release-node', 'store-release-label'
+        elif release.get('type') in ('branch', 'branch-start', 'branch-merge'):
+            node_class = f"{release['type']}-node"
+
+        layout['nodes'].append({
+            'index': index,
+            'x': x,
+            'y': y,
+            'label_y': label_y,
+            'node_class': node_class,
+            'label_class': label_class,
+            'label': release['version'].split('.')[-1],
+            'date_label': f"{dates[index].month}.{dates[index].day}"
+        })
+
+    return layout
+
+
+def render_release_diagram(out, releases):
+    """
+    输出预渲染的版本发布图SVG，节点的data-index对应releasesData.releases中的下标
+    Args:
+        out: 输出流
+        releases: 版本列表
+    """
+    valid = [release for release in releases if parse_release_date(release.get('date'))]
+    source_indexes = [index for index, release in enumerate(releases) if parse_release_date(release.get('date'))]
+    layout = layout_release_diagram(valid)
+
+    out.write(f'<svg id="release-diagram" viewBox="0 0 {layout["width"]} {layout["height"]}">')
+    out.write(SVG_DEFS)
+    if layout['main_path']:
+        out.write(f'<path d="{layout["main_path"]}" class="main-line" stroke="url(#mainGradient)" marker-end="url(#arrowhead)"></path>')
+    for path, merged in layout['branch_paths']:
+        # 未合并的分支用虚线
+        out.write(f'<path d="{path}" class="branch-line" stroke-dasharray="{"0" if merged else "5,5"}"></path>')
+    for node in layout['nodes']:
+        x = _fmt(node['x'])
+        out.write(
+            f'<g class="node" data-index="{source_indexes[node["index"]]}">'
+            f'<circle cx="{x}" cy="{_fmt(node["y"])}" r="{NODE_RADIUS}" class="{node["node_class"]}"></circle>'
+            f'<text x="{x}" y="{_fmt(node["label_y"])}" class="{node["label_class"]}">{escape(node["label"])}</text>'
+            f'<text x="{x}" y="{_fmt(node["y"] + 30)}" class="date-label">{node["date_label"]}</text>'
+            '</g>'
+        )
+    out.write('</svg>')
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+报告中心的静态搜索索引：构建时把页面标题、描述、版本号、统计项分词为倒排索引，
+导航页在浏览器端直接查询，不需要服务端
+"""
+
+import re
+import unicodedata
+from html.parser import HTMLParser
+
+SEARCH_INDEX_PATH = 'api/search_index.json'
+SEARCH_INDEX_VERSION = 1
+
+# 版本说明全文索引
+RELEASE_TEXT_INDEX_PATH = 'api/release_text_index.json'
+RELEASE_TEXT_INDEX_VERSION = 1
+
+# 中日韩统一表意文字（含扩展A和兼容区）
+CJK_RANGES = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+# 英文单词/数字（允许版本号这类以.、_、-连接的组合），或连续的中文
+TOKEN_PATTERN = re.compile(rf'[a-z0-9]+(?:[._-][a-z0-9]+)*|[{CJK_RANGES}]+')
+CJK_PATTERN = re.compile(rf'[{CJK_RANGES}]')
+TOKEN_SEPARATOR_PATTERN = re.compile(r'[._-]')
+
+
+def tokenize(text, expand_parts=True):
+    """
+    分词：英文和数字按单词切分并转小写，中文按相邻两字切分（bigram），单个汉字保留原字
+    与导航页中的JavaScript分词逻辑保持一致
+    Args:
+        text: 待分词的文本
+        expand_parts: 是否把1.0.16.220这类组合词额外拆出各个部分
+    Returns:
+        list: 词列表（可能有重复）
+    """
+    tokens = []
+    for word in TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        if CJK_PATTERN.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+            parts = TOKEN_SEPARATOR_PATTERN.split(word)
+            if expand_parts and len(parts) > 1:
+                tokens.extend(parts)
+    return tokens
+
+
+def page_search_text(page):
+    """拼接页面参与搜索的字段：标题、描述、日期、类型、地址和统计项名称"""
+    return ' '.join([
+        page.get('title', ''),
+        page.get('description', ''),
+        page.get('date_info', ''),
+        page.get('page_type', ''),
+        page.get('url', ''),
+        ' '.join(page.get('stats', {}))
+    ])
+
+
+def build_search_index(pages):
+    """
+    构建倒排索引
+    Args:
+        pages: 页面信息列表（按展示顺序，最新的在前）
+    Returns:
+        dict: {'version', 'docs': [[url, title, description, page_type, date_info]], 'terms': {词: [文档序号]}}
+    """
+    docs = []
+    terms = {}
+    for page in pages:
+        if page['url'] == 'index.html':
+            continue
+        doc_id = len(docs)
+        docs.append([page['url'], page['title'], page['description'], page['page_type'], page['date_info']])
+        for token in set(tokenize(page_search_text(page))):
+            terms.setdefault(token, []).append(doc_id)
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'docs': docs,
+        'terms': dict(sorted(terms.items()))
+    }
+
+
+class BodyTextParser(HTMLParser):
+    """提取<body>中的可见文本，跳过script/style"""
+    SKIPPED_TAGS = {'script', 'style', 'template', 'noscript'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._in_body = False
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self._in_body = True
+        elif tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._in_body and not self._skip_depth:
+            self.parts.append(data)
+
+
+def extract_body_text(content):
+    """
+    提取HTML正文文本
+    Args:
+        content: HTML文本
+    Returns:
+        str: 空白折叠后的正文
+    """
+    parser = BodyTextParser()
+    parser.feed(content)
+    parser.close()
+    return ' '.join(' '.join(parser.parts).split())
+
+
+def release_text_tokens(content):
+    """
+    版本说明正文的词集合，在建立页面索引时随页面一起解析并缓存
+    Args:
+        content: HTML文本
+    Returns:
+        list: 去重排序后的词列表
+    """
+    return sorted(set(tokenize(extract_body_text(content))))
+
+
+def build_release_text_index(releases):
+    """
+    构建版本说明的全文索引，正文词集合直接取自页面索引，不再读取文件
+    Args:
+        releases: scan_reports返回的releases列表（含path、version、release_date、tokens），按版本从新到旧
+    Returns:
+        dict: {'version', 'releases': [[版本号, 地址, 发布日期]], 'terms': {词: [版本序号]}}
+    """
+    docs = []
+    terms = {}
+    for release in releases:
+        doc_id = len(docs)
+        docs.append([release['version'], release['path'], release.get('release_date')])
+        for token in release['tokens']:
+            terms.setdefault(token, []).append(doc_id)
+
+    return {
+        'version': RELEASE_TEXT_INDEX_VERSION,
+        'releases': docs,
+        'terms': dict(sorted(terms.items()))
+    }
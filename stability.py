@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+运营稳定性计算引擎：一次遍历把监控历史按日期建立索引，再按天/按对象查询
+"""
+
+import os
+import json
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+from watch_dog_store import read_watch_dog_json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EPOCH_DATE = date(1970, 1, 1)
+
+# 稳定性统计粒度 -> (桶长度秒数, 桶起点相对epoch的偏移秒数, 桶显示格式)
+# 1970-01-01是星期四，周桶偏移4天使其从周一开始
+GRANULARITIES = {
+    'hour': (3600, 0, '%Y-%m-%d %H:00'),
+    'day': (86400, 0, '%Y-%m-%d'),
+    'week': (7 * 86400, 4 * 86400, '%Y-%m-%d'),
+}
+
+DEFAULT_WATCH_DOG_DIR = "config/watch_dog_data"
+DEFAULT_AGGREGATE_PATH = os.getenv('WATCH_DOG_AGGREGATE_PATH', '.cache/watch_dog_daily.json')
+AGGREGATE_FORMAT_VERSION = 1
+
+
+def build_stability_cell(total_checks, online_checks):
+    """
+    根据检查次数生成单个日历格子的稳定性数据
+    Args:
+        total_checks: 总检查次数
+        online_checks: 在线次数
+    Returns:
+        dict: 与calculate_daily_stability输出一致的格子数据
+    """
+    if total_checks > 0:
+        return {
+            'stability': online_checks / total_checks * 100,
+            'total_checks': total_checks,
+            'online_checks': online_checks,
+            'has_data': True
+        }
+    return {
+        'stability': None,
+        'total_checks': 0,
+        'online_checks': 0,
+        'has_data': False
+    }
+
+
+class StabilityIndex:
+    """
+    监控历史的按日索引
+    每条记录的时间戳只解析一次，计数按 {object_id: {date: [total, online]}} 保存
+    """
+    def __init__(self):
+        self.daily_counts = {}
+        self.object_names = {}
+
+    @classmethod
+    def from_watch_dog_data(cls, watch_dog_data):
+        """从load_watch_dog_data的结果建立索引"""
+        index = cls()
+        for object_id, obj_data in watch_dog_data.items():
+            index.add_history(object_id, obj_data.get('history', []), obj_data.get('objectName'))
+        return index
+
+    def add_history(self, object_id, history, object_name=None):
+        """
+        把一个监控对象的历史记录合并进索引
+        Args:
+            object_id: 监控对象ID
+            history: 历史记录列表
+            object_name: 监控对象显示名称
+        """
+        counts = self.daily_counts.setdefault(object_id, {})
+        if object_name:
+            self.object_names[object_id] = object_name
+
+        for record in history:
+            try:
+                record_date = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00')).date()
+            except Exception:
+                print(f"⚠️ 解析时间戳失败: {record.get('timestamp')}")
+                continue
+
+            day_counts = counts.get(record_date)
+            if day_counts is None:
+                day_counts = counts[record_date] = [0, 0]
+            day_counts[0] += 1
+            if record.get('status') == 'online':
+                day_counts[1] += 1
+
+    @classmethod
+    def from_store(cls, store):
+        """从watch_dog_store.open_watch_dog_store的结果建立索引"""
+        index = cls()
+        for columns in store.values():
+            index.add_columns(columns)
+        return index
+
+    def add_columns(self, columns):
+        """
+        把一个监控对象的列式历史（WatchDogColumns）合并进索引，按UTC日期分组
+        Args:
+            columns: WatchDogColumns对象
+        """
+        counts = self.daily_counts.setdefault(columns.object_id, {})
+        self.object_names[columns.object_id] = columns.object_name
+        online_code = columns.status_code('online')
+
+        day_totals = {}
+        day_online = {}
+        for seconds, status_code in zip(columns.timestamps, columns.status_codes):
+            day_number = seconds // 86400
+            day_totals[day_number] = day_totals.get(day_number, 0) + 1
+            if status_code == online_code:
+                day_online[day_number] = day_online.get(day_number, 0) + 1
+
+        for day_number, total in day_totals.items():
+            record_date = EPOCH_DATE + timedelta(days=day_number)
+            day_counts = counts.setdefault(record_date, [0, 0])
+            day_counts[0] += total
+            day_counts[1] += day_online.get(day_number, 0)
+
+    @classmethod
+    def from_daily_aggregate(cls, aggregate):
+        """从ingest_watch_dog_incremental持久化的按日汇总建立索引"""
+        index = cls()
+        for object_id, obj_state in aggregate.get('objects', {}).items():
+            index.object_names[object_id] = obj_state.get('objectName', object_id)
+            index.daily_counts[object_id] = {
+                date.fromisoformat(date_str): list(day_counts)
+                for date_str, day_counts in obj_state.get('days', {}).items()
+            }
+        return index
+
+    def object_ids(self):
+        """返回索引中的全部监控对象ID（保持加载顺序）"""
+        return list(self.daily_counts.keys())
+
+    def get_cell(self, object_id, day):
+        """
+        查询某个对象某一天的稳定性
+        Args:
+            object_id: 监控对象ID
+            day: date对象
+        Returns:
+            dict: 稳定性格子数据
+        """
+        total_checks, online_checks = self.daily_counts.get(object_id, {}).get(day, (0, 0))
+        return build_stability_cell(total_checks, online_checks)
+
+    def object_stability(self, object_id, start_date, end_date):
+        """
+        查询单个对象在日期范围内每天的稳定性
+        Returns:
+            dict: {date_str: 稳定性格子数据}
+        """
+        result = {}
+        current_date = start_date
+        while current_date <= end_date:
+            result[current_date.strftime('%Y-%m-%d')] = self.get_cell(object_id, current_date.date())
+            current_date += timedelta(days=1)
+        return result
+
+    def daily_stability(self, start_date, end_date):
+        """
+        计算日期范围内每天、每个对象的稳定性
+        Args:
+            start_date: 开始日期（datetime）
+            end_date: 结束日期（datetime）
+        Returns:
+            dict: {date_str: {object_id: 稳定性格子数据}}
+        """
+        object_ids = self.object_ids()
+        daily_stats = {}
+        current_date = start_date
+
+        while current_date <= end_date:
+            day = current_date.date()
+            daily_stats[current_date.strftime('%Y-%m-%d')] = {
+                object_id: self.get_cell(object_id, day) for object_id in object_ids
+            }
+            current_date += timedelta(days=1)
+
+        return daily_stats
+
+
+def calculate_daily_stability(watch_dog_data, start_date, end_date):
+    """
+    计算每天的稳定性数据（索引版本，输出与utils.calculate_daily_stability一致）
+    Args:
+        watch_dog_data: 监控数据
+        start_date: 开始日期
+        end_date: 结束日期
+    Returns:
+        dict: 每天的稳定性数据
+    """
+    return StabilityIndex.from_watch_dog_data(watch_dog_data).daily_stability(start_date, end_date)
+
+
+def _parse_record_time(record):
+    try:
+        return datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00'))
+    except Exception:
+        print(f"⚠️ 解析时间戳失败: {record.get('timestamp')}")
+        return None
+
+
+def _find_new_records_start(history, obj_state):
+    """
+    找到history中第一条高水位之后的记录下标
+    监控只会在末尾追加，优先用上次的记录数定位，对不上时再从尾部向前扫描
+    """
+    high_water_mark = obj_state.get('high_water_mark')
+    if not high_water_mark:
+        return 0
+
+    ingested_records = obj_state.get('ingested_records', 0)
+    if 0 < ingested_records <= len(history) and history[ingested_records - 1].get('timestamp') == high_water_mark:
+        return ingested_records
+
+    high_water_time = datetime.fromisoformat(high_water_mark.replace('Z', '+00:00'))
+    start = len(history)
+    while start > 0:
+        record_time = _parse_record_time(history[start - 1])
+        if record_time is not None and record_time <= high_water_time:
+            break
+        start -= 1
+    return start
+
+
+def load_daily_aggregate(aggregate_path=DEFAULT_AGGREGATE_PATH):
+    """
+    加载持久化的按日稳定性汇总，不存在或版本不符时返回空汇总
+    """
+    try:
+        with open(aggregate_path, 'r', encoding='utf-8') as f:
+            aggregate = json.load(f)
+        if aggregate.get('format_version') == AGGREGATE_FORMAT_VERSION:
+            return aggregate
+        print(f"⚠️ 稳定性汇总版本不符，重新全量汇总: {aggregate_path}")
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ 无法加载稳定性汇总 {aggregate_path}: {e}")
+
+    return {'format_version': AGGREGATE_FORMAT_VERSION, 'sources': {}, 'objects': {}}
+
+
+def save_daily_aggregate(aggregate, aggregate_path=DEFAULT_AGGREGATE_PATH):
+    """原子写入按日稳定性汇总"""
+    os.makedirs(os.path.dirname(aggregate_path) or '.', exist_ok=True)
+    tmp_path = f"{aggregate_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(aggregate, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, aggregate_path)
+
+
+def ingest_watch_dog_incremental(watch_dog_dir=DEFAULT_WATCH_DOG_DIR, aggregate_path=DEFAULT_AGGREGATE_PATH):
+    """
+    增量汇总监控数据：源文件未变化时直接跳过，只追加了记录时只读取并解析游标之后的新记录，
+    并合并到持久化的按日汇总（每个对象每天的总检查次数/在线次数）
+    Args:
+        watch_dog_dir: 监控JSON目录
+        aggregate_path: 按日汇总文件路径
+    Returns:
+        dict: 更新后的按日汇总
+    """
+    aggregate = load_daily_aggregate(aggregate_path)
+
+    if not os.path.exists(watch_dog_dir):
+        print(f"⚠️ 监控数据目录不存在: {watch_dog_dir}")
+        return aggregate
+
+    filenames = sorted(f for f in os.listdir(watch_dog_dir) if f.endswith('.json'))
+    changed = False
+
+    # 源文件已删除的监控对象不再出现在报告中
+    for filename in set(aggregate['sources']) - set(filenames):
+        removed = aggregate['sources'].pop(filename)
+        aggregate['objects'].pop(removed.get('objectId'), None)
+        changed = True
+
+    for filename in filenames:
+
+        file_path = os.path.join(watch_dog_dir, filename)
+        file_stat = os.stat(file_path)
+        source_state = aggregate['sources'].get(filename, {})
+        if source_state.get('size') == file_stat.st_size and source_state.get('mtime') == file_stat.st_mtime:
+            continue
+
+        # 文件只在history末尾追加了记录时，只读取上次游标之后的新记录
+        cursor = source_state.get('cursor') if source_state.get('objectId') in aggregate['objects'] else None
+        try:
+            data, new_cursor, appended = read_watch_dog_json(file_path, cursor)
+            if appended and data.get('objectId') != source_state.get('objectId'):
+                data, new_cursor, appended = read_watch_dog_json(file_path)
+        except (OSError, ValueError) as e:
+            print(f"❌ 加载监控数据失败 {file_path}: {e}")
+            continue
+
+        object_id = data.get('objectId')
+        if not object_id:
+            continue
+
+        history = data.get('history', [])
+        obj_state = aggregate['objects'].setdefault(object_id, {'days': {}})
+        # 增量读取时history只有新记录；完整读取（首次或文件被改写）时按高水位定位新记录
+        start = 0 if appended else _find_new_records_start(history, obj_state)
+        ingested_records = obj_state.get('ingested_records', 0) + len(history) if appended else len(history)
+        days = obj_state['days']
+
+        high_water_time = None
+        high_water_mark = obj_state.get('high_water_mark')
+        if high_water_mark:
+            high_water_time = datetime.fromisoformat(high_water_mark.replace('Z', '+00:00'))
+
+        for record in history[start:]:
+            record_time = _parse_record_time(record)
+            if record_time is None:
+                continue
+            day_counts = days.setdefault(record_time.date().isoformat(), [0, 0])
+            day_counts[0] += 1
+            if record.get('status') == 'online':
+                day_counts[1] += 1
+            if high_water_time is None or record_time > high_water_time:
+                high_water_time = record_time
+                high_water_mark = record['timestamp']
+
+        obj_state.update({
+            'objectName': data.get('objectName', object_id),
+            'lastUpdated': data.get('lastUpdated'),
+            'totalRecords': data.get('totalRecords'),
+            'high_water_mark': high_water_mark,
+            'ingested_records': ingested_records
+        })
+        aggregate['sources'][filename] = {
+            'objectId': object_id,
+            'size': file_stat.st_size,
+            'mtime': file_stat.st_mtime,
+            'cursor': new_cursor
+        }
+        changed = True
+        print(f"✅ 增量汇总监控数据: {obj_state['objectName']} (新增 {len(history) - start} 条记录)")
+
+    if changed:
+        save_daily_aggregate(aggregate, aggregate_path)
+
+    return aggregate
+
+
+def calculate_daily_stability_incremental(start_date, end_date, watch_dog_dir=DEFAULT_WATCH_DOG_DIR,
+                                          aggregate_path=DEFAULT_AGGREGATE_PATH):
+    """
+    基于增量汇总计算每天的稳定性数据，输出与calculate_daily_stability一致
+    Args:
+        start_date: 开始日期
+        end_date: 结束日期
+        watch_dog_dir: 监控JSON目录
+        aggregate_path: 按日汇总文件路径
+    Returns:
+        dict: 每天的稳定性数据
+    """
+    aggregate = ingest_watch_dog_incremental(watch_dog_dir, aggregate_path)
+    return StabilityIndex.from_daily_aggregate(aggregate).daily_stability(start_date, end_date)
+
+
+def history_to_arrays(history):
+    """
+    把监控历史转换为numpy数组
+    Args:
+        history: 历史记录列表
+    Returns:
+        tuple: (int64 epoch秒数组, bool在线标记数组)
+    """
+    timestamps = [record.get('timestamp') for record in history]
+    online = np.fromiter((record.get('status') == 'online' for record in history), dtype=bool, count=len(history))
+
+    try:
+        # 源数据统一为UTC的'Z'结尾时间戳，去掉后缀即可交给numpy整体解析
+        if not all(isinstance(ts, str) and ts.endswith('Z') for ts in timestamps):
+            raise ValueError("时间戳格式不统一")
+        milliseconds = np.array([ts[:-1] for ts in timestamps], dtype='datetime64[ms]').astype(np.int64)
+        return milliseconds // 1000, online
+    except ValueError:
+        pass
+
+    seconds = np.empty(len(history), dtype=np.int64)
+    valid = np.ones(len(history), dtype=bool)
+    for i, record in enumerate(history):
+        record_time = _parse_record_time(record)
+        if record_time is None:
+            valid[i] = False
+        else:
+            seconds[i] = int(record_time.timestamp())
+    return seconds[valid], online[valid]
+
+
+def _bucket_range(start_date, end_date, granularity):
+    bucket_seconds, offset, _ = GRANULARITIES[granularity]
+    start_seconds = int(start_date.replace(tzinfo=timezone.utc).timestamp())
+    end_seconds = int(end_date.replace(tzinfo=timezone.utc).timestamp())
+    first_bucket = (start_seconds - offset) // bucket_seconds
+    bucket_count = (end_seconds - offset) // bucket_seconds - first_bucket + 1
+    return first_bucket * bucket_seconds + offset, bucket_seconds, max(bucket_count, 0)
+
+
+def bucket_counts(seconds, online, bucket_origin, bucket_seconds, bucket_count):
+    """
+    用一次np.bincount把检查记录按时间桶汇总
+    Returns:
+        tuple: (每个桶的总检查次数, 每个桶的在线次数)
+    """
+    bucket_index = (seconds - bucket_origin) // bucket_seconds
+    in_range = (bucket_index >= 0) & (bucket_index < bucket_count)
+    bucket_index = bucket_index[in_range]
+    totals = np.bincount(bucket_index, minlength=bucket_count)
+    online_totals = np.bincount(bucket_index[online[in_range]], minlength=bucket_count)
+    return totals, online_totals
+
+
+def calculate_stability_numpy(watch_dog_data, start_date, end_date, granularity='day'):
+    """
+    用numpy向量化计算按小时/天/周分桶的稳定性数据（UTC时间分桶）
+    granularity为'day'时输出与calculate_daily_stability一致
+    Args:
+        watch_dog_data: 监控数据（load_watch_dog_data的结果）或列式存储（open_watch_dog_store的结果）
+        start_date: 开始时间，对齐到所在桶的起点
+        end_date: 结束时间，对齐到所在桶的起点
+        granularity: 'hour'、'day'或'week'
+    Returns:
+        dict: {桶标签: {object_id: 稳定性格子数据}}
+    """
+    if np is None:
+        raise RuntimeError("numpy未安装，无法使用向量化稳定性计算")
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"不支持的稳定性粒度: {granularity}")
+
+    bucket_origin, bucket_seconds, bucket_count = _bucket_range(start_date, end_date, granularity)
+    label_format = GRANULARITIES[granularity][2]
+    labels = [
+        datetime.fromtimestamp(bucket_origin + i * bucket_seconds, tz=timezone.utc).strftime(label_format)
+        for i in range(bucket_count)
+    ]
+
+    per_object = {}
+    for object_id, source in watch_dog_data.items():
+        if isinstance(source, dict):
+            seconds, online = history_to_arrays(source.get('history', []))
+        else:
+            columns = source.as_numpy()
+            seconds = columns['timestamps']
+            status_codes = columns['status_codes']
+            if source.sorted:
+                # 时间戳有序时二分定位窗口，只对窗口内的记录分桶，耗时与历史总长度无关
+                lo, hi = np.searchsorted(seconds, [bucket_origin, bucket_origin + bucket_count * bucket_seconds])
+                seconds, status_codes = seconds[lo:hi], status_codes[lo:hi]
+            online = status_codes == source.status_code('online')
+        totals, online_totals = bucket_counts(seconds, online, bucket_origin, bucket_seconds, bucket_count)
+        per_object[object_id] = (totals.tolist(), online_totals.tolist())
+
+    stats = {}
+    for i, label in enumerate(labels):
+        stats[label] = {
+            object_id: build_stability_cell(totals[i], online_totals[i])
+            for object_id, (totals, online_totals) in per_object.items()
+        }
+    return stats
+
+
+def build_history_sidecar(store, start_date, end_date):
+    """
+    把展示窗口内的逐次检查记录整理为按对象、按天分组的紧凑结构，供页面在查看明细时按需加载
+    时间戳有序时二分定位窗口，耗时只与窗口内的记录数有关
+    Args:
+        store: 列式存储（open_watch_dog_store的结果）
+        start_date: 开始日期
+        end_date: 结束日期（包含当天）
+    Returns:
+        dict: {'statuses': [...], 'details': [...],
+               'objects': {object_id: {date_str: [[当天秒数, 状态下标, 详情下标], ...]}}}
+    """
+    window_start = (start_date.date() - EPOCH_DATE).days * 86400
+    window_end = ((end_date.date() - EPOCH_DATE).days + 1) * 86400
+    statuses, details = [], []
+    status_lookup, details_lookup = {}, {}
+    objects = {}
+
+    for object_id, columns in store.items():
+        timestamps = columns.timestamps
+        if columns.sorted:
+            indexes = range(bisect_left(timestamps, window_start), bisect_left(timestamps, window_end))
+        else:
+            indexes = [i for i, seconds in enumerate(timestamps) if window_start <= seconds < window_end]
+
+        days = {}
+        day_labels = {}
+        for i in indexes:
+            day_number, seconds_of_day = divmod(timestamps[i], 86400)
+            day_label = day_labels.get(day_number)
+            if day_label is None:
+                day_label = day_labels[day_number] = (EPOCH_DATE + timedelta(days=day_number)).isoformat()
+
+            # 存储中的字典表按对象独立编码，这里重新编码为整个文件共用的字典表
+            status = columns.statuses[columns.status_codes[i]]
+            if status not in status_lookup:
+                status_lookup[status] = len(statuses)
+                statuses.append(status)
+            detail = columns.details[columns.details_codes[i]]
+            if detail not in details_lookup:
+                details_lookup[detail] = len(details)
+                details.append(detail)
+
+            days.setdefault(day_label, []).append([seconds_of_day, status_lookup[status], details_lookup[detail]])
+        objects[object_id] = days
+
+    return {'statuses': statuses, 'details': details, 'objects': objects}
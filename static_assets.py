@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+共享静态资源：把templates目录中的CSS/JS按内容哈希发布为 static/<名称>.<哈希>.<扩展名>，
+所有页面引用同一份带指纹的文件，浏览器跨页面长期缓存；第三方库下载到static/vendor本地引用
+"""
+
+import os
+import hashlib
+from template_engine import TEMPLATE_DIR
+from output_stage import minify_bytes
+from utils import download_external_resource, write_bytes_atomic
+
+STATIC_DIR = os.getenv('STATIC_DIR', 'static')
+FINGERPRINT_LENGTH = 12
+
+# 第三方库: 名称 -> (CDN地址, static目录下的本地路径)，本地路径包含版本号，内容不会变化
+VENDOR_LIBRARIES = {
+    'chart.js': (
+        'https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js',
+        'vendor/chart.js/3.9.1/chart.min.js'
+    ),
+}
+
+
+def publish_static(name, template_dir=TEMPLATE_DIR):
+    """
+    把模板目录中的静态文件压缩后发布为带内容指纹的文件，内容不变时文件名不变
+    旧版本文件保留不删，已生成的历史日报仍然引用它们
+    Args:
+        name: 模板目录中的文件名，例如 daily_report.css
+        template_dir: 模板目录
+    Returns:
+        str: 发布后的路径（相对仓库根目录），例如 static/daily_report.3f2a9c1d7b4e.css
+    """
+    with open(os.path.join(template_dir, name), 'rb') as f:
+        data = minify_bytes(name, f.read())
+
+    digest = hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+    stem, extension = os.path.splitext(name)
+    static_path = f"{STATIC_DIR}/{stem}.{digest}{extension}"
+
+    if not os.path.exists(static_path):
+        write_bytes_atomic(static_path, data)
+        print(f"📦 发布静态资源: {static_path}")
+
+    return static_path
+
+
+def vendor_library(name):
+    """
+    把第三方库下载到static/vendor，已存在时不重复下载
+    Args:
+        name: VENDOR_LIBRARIES中的库名
+    Returns:
+        str: 本地路径（相对仓库根目录），下载失败时返回None
+    """
+    url, relative_path = VENDOR_LIBRARIES[name]
+    local_path = f"{STATIC_DIR}/{relative_path}"
+    if os.path.exists(local_path):
+        return local_path
+
+    if download_external_resource(url, local_path):
+        print(f"📦 本地化第三方库 {name}: {local_path}")
+        return local_path
+
+    print(f"⚠️ 下载第三方库失败，继续使用CDN: {name}")
+    return None
+
+
+def localize_vendor_references(html_path):
+    """
+    把页面中引用的第三方库CDN地址替换为本地副本
+    Args:
+        html_path: HTML文件路径
+    Returns:
+        int: 替换的库数量
+    """
+    with open(html_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    replaced = 0
+    for name, (url, _) in VENDOR_LIBRARIES.items():
+        if url not in content:
+            continue
+        local_path = vendor_library(name)
+        if local_path:
+            content = content.replace(url, f"/{local_path}")
+            replaced += 1
+
+    if replaced:
+        write_bytes_atomic(html_path, content.encode('utf-8'))
+    return replaced
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+轻量模板引擎：模板中的 {{ name }} 插槽在首次加载时编译为片段列表并缓存，
+渲染时把字面文本和各插槽内容依次写入输出流，不在内存中拼接整页字符串
+"""
+
+import io
+import os
+import re
+import time
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+SLOT_PATTERN = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}')
+
+# 模板路径 -> (文件修改时间, 编译后的模板)
+_template_cache = {}
+
+
+class Template:
+    """
+    编译后的模板：parts中偶数下标为字面文本，奇数下标为插槽名
+    """
+    def __init__(self, source, name='<string>'):
+        self.name = name
+        self.parts = []
+        pos = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self.parts.append(source[pos:match.start()])
+            self.parts.append(match.group(1))
+            pos = match.end()
+        self.parts.append(source[pos:])
+        self.slots = set(self.parts[1::2])
+
+    def render(self, out, context, timings=None):
+        """
+        把模板渲染到输出流
+        Args:
+            out: 支持write()的文本流
+            context: 插槽名 -> 值；值为可调用对象时作为区块渲染器调用 value(out)，自行写入输出流
+            timings: 传入dict时累计每个区块渲染器的耗时（秒）
+        Raises:
+            KeyError: context中缺少模板需要的插槽
+        """
+        missing = self.slots - context.keys()
+        if missing:
+            raise KeyError(f"模板 {self.name} 缺少插槽: {', '.join(sorted(missing))}")
+
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                out.write(part)
+                continue
+
+            value = context[part]
+            if not callable(value):
+                out.write(str(value))
+                continue
+
+            start = time.perf_counter()
+            value(out)
+            if timings is not None:
+                timings[part] = timings.get(part, 0.0) + time.perf_counter() - start
+
+    def render_to_string(self, context, timings=None):
+        """渲染为字符串（小模板或需要整页字符串时使用）"""
+        buffer = io.StringIO()
+        self.render(buffer, context, timings)
+        return buffer.getvalue()
+
+
+def load_template(name, template_dir=TEMPLATE_DIR):
+    """
+    加载并编译模板，按文件修改时间缓存，模板文件未变化时不重复编译
+    Args:
+        name: 模板文件名，例如 daily_report.html
+        template_dir: 模板目录
+    Returns:
+        Template: 编译后的模板
+    """
+    path = os.path.join(template_dir, name)
+    mtime = os.stat(path).st_mtime
+    cached = _template_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        template = Template(f.read(), name)
+    _template_cache[path] = (mtime, template)
+    return template
+
+
+def print_render_timings(timings, total):
+    """打印每个区块的渲染耗时，按耗时从高到低排列"""
+    print(f"⏱️ 页面渲染耗时 {total:.3f}s:")
+    for slot, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"   {slot:<28} {elapsed * 1000:>8.2f} ms")
@@ -0,0 +1,285 @@
+let stabilityHistoryPromise = null;
+let activeStabilityCell = null;
+
+function showTooltip(event, release) {
+    const tooltip = document.getElementById('tooltip');
+    tooltip.innerHTML = `
+        <div><strong>版本号：</strong>${release.version}</div>
+        <div><strong>发布日期：</strong>${release.date}</div>
+        <div><strong>部署环境：</strong>${release.environment}</div>
+        <div><strong>版本类型：</strong>${release.note}</div>
+    `;
+
+    // 获取鼠标位置
+    const mouseX = event.clientX;
+    const mouseY = event.clientY;
+
+    // 设置 tooltip 位置
+    tooltip.style.left = (mouseX + 15) + 'px';
+    tooltip.style.top = (mouseY - 60) + 'px';
+
+    // 显示 tooltip
+    tooltip.classList.add('visible');
+}
+
+function hideTooltip() {
+    const tooltip = document.getElementById('tooltip');
+    tooltip.classList.remove('visible');
+}
+
+// 按需加载逐次检查明细（gzip压缩的JSON，只在第一次查看时请求）
+function loadStabilityHistory() {
+    if (!stabilityHistoryPromise) {
+        if (!stabilityHistoryUrl || typeof DecompressionStream === 'undefined') {
+            stabilityHistoryPromise = Promise.resolve(null);
+        } else {
+            stabilityHistoryPromise = fetch(stabilityHistoryUrl)
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                    return new Response(stream).json();
+                })
+                .catch(error => {
+                    console.warn('加载监控明细失败:', error);
+                    return null;
+                });
+        }
+    }
+    return stabilityHistoryPromise;
+}
+
+// 从明细中取出单元格时间段内的异常检查记录
+function getAbnormalChecks(history, objectId, cellDate) {
+    const days = (history.objects || {})[objectId] || {};
+    let dayKeys = [cellDate.slice(0, 10)];
+    let hour = null;
+    if (stabilityGranularity === 'hour') {
+        hour = parseInt(cellDate.slice(11, 13), 10);
+    } else if (stabilityGranularity === 'week') {
+        const weekStart = new Date(cellDate + 'T00:00:00Z');
+        dayKeys = [];
+        for (let i = 0; i < 7; i++) {
+            dayKeys.push(new Date(weekStart.getTime() + i * 86400000).toISOString().slice(0, 10));
+        }
+    }
+
+    const abnormal = [];
+    dayKeys.forEach(dayKey => {
+        (days[dayKey] || []).forEach(([seconds, statusIndex, detailsIndex]) => {
+            const status = history.statuses[statusIndex];
+            if (status === 'online') return;
+            if (hour !== null && Math.floor(seconds / 3600) !== hour) return;
+            const hh = String(Math.floor(seconds / 3600)).padStart(2, '0');
+            const mm = String(Math.floor(seconds % 3600 / 60)).padStart(2, '0');
+            abnormal.push({ time: `${dayKey.slice(5)} ${hh}:${mm}`, status, details: history.details[detailsIndex] });
+        });
+    });
+    return abnormal;
+}
+
+function appendStabilityDetails(tooltip, cell, history) {
+    if (!history || activeStabilityCell !== cell || !cell.hasData) return;
+    const abnormal = getAbnormalChecks(history, cell.objectId, cell.date);
+    const details = document.createElement('div');
+    if (abnormal.length === 0) {
+        details.innerHTML = '<strong>异常记录：</strong>无';
+    } else {
+        const lines = abnormal.slice(0, 5).map(item => `${item.time} ${item.status} ${item.details}`);
+        if (abnormal.length > 5) lines.push(`…共 ${abnormal.length} 条`);
+        details.innerHTML = '<strong>异常记录：</strong><br>' + lines.join('<br>');
+    }
+    tooltip.appendChild(details);
+}
+
+// 从div日历的单元格读取格子信息
+function readStabilityCell(element) {
+    return {
+        objectId: element.getAttribute('data-object-id'),
+        date: element.getAttribute('data-date'),
+        hasData: !element.classList.contains('no-data'),
+        stability: element.getAttribute('data-stability'),
+        online: element.getAttribute('data-online'),
+        total: element.getAttribute('data-total')
+    };
+}
+
+// 稳定性详情展示，cell为格子信息 {objectId, date, hasData, stability, online, total}
+function showStabilityTooltip(event, cell) {
+    const tooltip = document.getElementById('tooltip');
+    const objectName = stabilityObjects[cell.objectId] || cell.objectId;
+    activeStabilityCell = cell;
+
+    if (!cell.hasData) {
+        tooltip.innerHTML = `
+            <div><strong>监控对象：</strong>${objectName}</div>
+            <div><strong>日期：</strong>${cell.date}</div>
+            <div><strong>状态：</strong>无数据</div>
+        `;
+    } else {
+        tooltip.innerHTML = `
+            <div><strong>监控对象：</strong>${objectName}</div>
+            <div><strong>日期：</strong>${cell.date}</div>
+            <div><strong>稳定性：</strong>${cell.stability}%</div>
+            <div><strong>在线次数：</strong>${cell.online}/${cell.total}</div>
+        `;
+    }
+
+    // 获取鼠标位置
+    const mouseX = event.clientX;
+    const mouseY = event.clientY;
+
+    // 设置 tooltip 位置
+    tooltip.style.left = (mouseX + 15) + 'px';
+    tooltip.style.top = (mouseY - 60) + 'px';
+
+    // 显示 tooltip
+    tooltip.classList.add('visible');
+
+    loadStabilityHistory().then(history => appendStabilityDetails(tooltip, cell, history));
+}
+
+function hideStabilityTooltip() {
+    activeStabilityCell = null;
+    hideTooltip();
+}
+
+// div日历：在日历容器上委托处理所有格子的悬停（图例中的格子不在容器内）
+function bindStabilityCalendar(calendar) {
+    calendar.addEventListener('mouseover', (e) => {
+        const element = e.target.closest('.stability-cell');
+        if (!element || element.contains(e.relatedTarget)) return;
+        showStabilityTooltip(e, readStabilityCell(element));
+    });
+    calendar.addEventListener('mouseout', (e) => {
+        const element = e.target.closest('.stability-cell');
+        if (!element || element.contains(e.relatedTarget)) return;
+        hideStabilityTooltip();
+    });
+}
+
+// 画布热力图的几何尺寸，与div日历的样式保持一致
+const HEATMAP = {
+    nameWidth: 270,
+    cellWidth: 12,
+    cellHeight: 20,
+    cellGap: 1,
+    rowGap: 8,
+    // 部分浏览器限制画布单边不超过16384像素
+    maxCanvasSize: 16384,
+    colors: { excellent: '#4caf50', fair: '#ff9800', critical: '#f44336', noData: '#e0e0e0' }
+};
+
+function heatmapColor(total, offline) {
+    if (total === 0) return HEATMAP.colors.noData;
+    if (offline === 0) return HEATMAP.colors.excellent;
+    return (total - offline) / total * 100 >= 95 ? HEATMAP.colors.fair : HEATMAP.colors.critical;
+}
+
+function truncateText(context, text, maxWidth) {
+    if (context.measureText(text).width <= maxWidth) return text;
+    let end = text.length;
+    while (end > 0 && context.measureText(text.slice(0, end) + '…').width > maxWidth) end--;
+    return text.slice(0, end) + '…';
+}
+
+// 画布热力图：按编码矩阵绘制所有格子，悬停时由坐标换算出格子
+function drawStabilityHeatmap(canvas, matrix) {
+    const rows = matrix.objects.length;
+    const columns = matrix.dates.length;
+    const columnStride = HEATMAP.cellWidth + HEATMAP.cellGap;
+    const rowStride = HEATMAP.cellHeight + HEATMAP.rowGap;
+    const width = HEATMAP.nameWidth + columns * columnStride;
+    const height = rows * rowStride;
+
+    const scale = Math.min(window.devicePixelRatio || 1, HEATMAP.maxCanvasSize / width, HEATMAP.maxCanvasSize / height);
+    canvas.width = Math.floor(width * scale);
+    canvas.height = Math.floor(height * scale);
+    canvas.style.width = width + 'px';
+    canvas.style.height = height + 'px';
+
+    const context = canvas.getContext('2d');
+    context.scale(scale, scale);
+    context.font = '500 14px sans-serif';
+    context.textBaseline = 'middle';
+    context.fillStyle = getComputedStyle(document.documentElement).getPropertyValue('--text-color').trim() || '#333';
+    for (let row = 0; row < rows; row++) {
+        const objectId = matrix.objects[row];
+        const name = stabilityObjects[objectId] || objectId;
+        context.fillText(truncateText(context, name, HEATMAP.nameWidth - 20), 0, row * rowStride + HEATMAP.cellHeight / 2);
+    }
+
+    // 同色格子连续绘制，减少fillStyle切换
+    Object.values(HEATMAP.colors).forEach(color => {
+        context.fillStyle = color;
+        for (let row = 0, i = 0; row < rows; row++) {
+            const y = row * rowStride;
+            for (let column = 0; column < columns; column++, i++) {
+                if (heatmapColor(matrix.total[i], matrix.offline[i]) !== color) continue;
+                context.fillRect(HEATMAP.nameWidth + column * columnStride, y, HEATMAP.cellWidth, HEATMAP.cellHeight);
+            }
+        }
+    });
+
+    const cellAt = (event) => {
+        const rect = canvas.getBoundingClientRect();
+        const x = event.clientX - rect.left - HEATMAP.nameWidth;
+        const y = event.clientY - rect.top;
+        const column = Math.floor(x / columnStride);
+        const row = Math.floor(y / rowStride);
+        if (x < 0 || column >= columns || row < 0 || row >= rows) return null;
+        if (x - column * columnStride >= HEATMAP.cellWidth || y - row * rowStride >= HEATMAP.cellHeight) return null;
+        return row * columns + column;
+    };
+
+    let hoveredIndex = null;
+    canvas.addEventListener('mousemove', (e) => {
+        const index = cellAt(e);
+        if (index === hoveredIndex) return;
+        hoveredIndex = index;
+        canvas.style.cursor = index === null ? 'default' : 'pointer';
+        if (index === null) {
+            hideStabilityTooltip();
+            return;
+        }
+        const total = matrix.total[index];
+        const online = total - matrix.offline[index];
+        showStabilityTooltip(e, {
+            objectId: matrix.objects[Math.floor(index / columns)],
+            date: matrix.dates[index % columns],
+            hasData: total > 0,
+            stability: total > 0 ? (online / total * 100).toFixed(1) : null,
+            online: online,
+            total: total
+        });
+    });
+    canvas.addEventListener('mouseleave', () => {
+        hoveredIndex = null;
+        hideStabilityTooltip();
+    });
+}
+
+// 版本发布图在构建时预渲染，这里只在SVG上委托绑定节点的提示框
+function bindDiagramTooltips() {
+    const svg = document.getElementById('release-diagram');
+    svg.addEventListener('mouseover', (e) => {
+        const node = e.target.closest('.node');
+        if (!node || node.contains(e.relatedTarget)) return;
+        showTooltip(e, releasesData.releases[node.getAttribute('data-index')]);
+    });
+    svg.addEventListener('mouseout', (e) => {
+        const node = e.target.closest('.node');
+        if (!node || node.contains(e.relatedTarget)) return;
+        hideTooltip();
+    });
+}
+
+// 页面加载时绑定事件
+window.addEventListener('load', () => {
+    bindDiagramTooltips();
+
+    const calendar = document.querySelector('.stability-calendar');
+    if (calendar) bindStabilityCalendar(calendar);
+
+    const heatmap = document.getElementById('stability-heatmap');
+    if (heatmap) drawStabilityHeatmap(heatmap, JSON.parse(document.getElementById('stability-matrix').textContent));
+});
@@ -0,0 +1,134 @@
+// 客户端搜索：首次使用时加载构建期生成的倒排索引，分词规则与search_index.py一致
+(function() {
+    const CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff';
+    const TOKEN_PATTERN = new RegExp('[a-z0-9]+(?:[._-][a-z0-9]+)*|[' + CJK + ']+', 'g');
+    const CJK_PATTERN = new RegExp('^[' + CJK + ']');
+    const MAX_RESULTS = 20;
+    const input = document.getElementById('search-input');
+    const resultsBox = document.getElementById('search-results');
+    const indexPromises = {};
+
+    function loadIndex(path) {
+        if (!indexPromises[path]) {
+            indexPromises[path] = fetch(path)
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.json();
+                })
+                .then(index => {
+                    // 用Map保存词条，避免constructor等查询命中Object.prototype上的属性
+                    index.terms = new Map(Object.entries(index.terms));
+                    index.sortedTerms = Array.from(index.terms.keys()).sort();
+                    return index;
+                });
+        }
+        return indexPromises[path];
+    }
+
+    // 版本说明全文索引是附加功能，加载失败（例如还没有任何版本）时按空索引处理，不影响标题搜索
+    function loadReleaseIndex() {
+        return loadIndex(input.dataset.releaseIndex).catch(error => {
+            console.warn('加载版本说明全文索引失败:', error);
+            return { releases: [], terms: new Map(), sortedTerms: [] };
+        });
+    }
+
+    // 页面索引（标题、描述等）和版本说明全文索引
+    function loadIndexes() {
+        return Promise.all([loadIndex(input.dataset.searchIndex), loadReleaseIndex()]);
+    }
+
+    function tokenize(text) {
+        const tokens = [];
+        for (const word of text.normalize('NFKC').toLowerCase().match(TOKEN_PATTERN) || []) {
+            if (CJK_PATTERN.test(word)) {
+                if (word.length === 1) tokens.push(word);
+                for (let i = 0; i + 1 < word.length; i++) tokens.push(word.slice(i, i + 2));
+            } else {
+                tokens.push(word);
+            }
+        }
+        return tokens;
+    }
+
+    // 精确匹配词条，没有时按前缀匹配（输入中的版本号或单词只打了一部分）
+    function lookup(index, token) {
+        if (index.terms.has(token)) return index.terms.get(token);
+        const terms = index.sortedTerms;
+        let low = 0, high = terms.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (terms[mid] < token) low = mid + 1; else high = mid;
+        }
+        const docIds = new Set();
+        for (let i = low; i < terms.length && terms[i].startsWith(token); i++) {
+            index.terms.get(terms[i]).forEach(id => docIds.add(id));
+        }
+        return Array.from(docIds).sort((a, b) => a - b);
+    }
+
+    function search(index, query) {
+        const tokens = Array.from(new Set(tokenize(query)));
+        if (!tokens.length) return [];
+        const postings = tokens.map(token => lookup(index, token)).sort((a, b) => a.length - b.length);
+        let result = postings[0];
+        for (let i = 1; i < postings.length && result.length; i++) {
+            const ids = new Set(postings[i]);
+            result = result.filter(id => ids.has(id));
+        }
+        return result;
+    }
+
+    function appendResult(url, titleText, metaText) {
+        const link = document.createElement('a');
+        link.className = 'search-result';
+        link.href = url;
+        const titleElem = document.createElement('div');
+        titleElem.className = 'report-title';
+        titleElem.textContent = titleText;
+        const metaElem = document.createElement('div');
+        metaElem.className = 'report-meta';
+        metaElem.textContent = metaText;
+        link.appendChild(titleElem);
+        link.appendChild(metaElem);
+        resultsBox.appendChild(link);
+    }
+
+    function render(pageIndex, releaseIndex, query, docIds, releaseIds, elapsed) {
+        const pageUrls = new Set(docIds.map(id => pageIndex.docs[id][0]));
+        // 标题已命中的版本不再在全文结果中重复出现
+        releaseIds = releaseIds.filter(id => !pageUrls.has(releaseIndex.releases[id][1]));
+
+        resultsBox.innerHTML = '';
+        const summary = document.createElement('div');
+        summary.className = 'search-summary';
+        summary.textContent = `“${query}” 共找到 ${docIds.length} 个页面，${releaseIds.length} 个版本说明正文匹配（${elapsed.toFixed(2)} ms）`;
+        resultsBox.appendChild(summary);
+
+        for (const id of docIds.slice(0, MAX_RESULTS)) {
+            const [url, title, description, pageType, dateInfo] = pageIndex.docs[id];
+            appendResult(url, description || title, [pageType, dateInfo, url].filter(Boolean).join(' · '));
+        }
+        for (const id of releaseIds.slice(0, MAX_RESULTS)) {
+            const [version, url, releaseDate] = releaseIndex.releases[id];
+            appendResult(url, `Release ${version}`, ['版本说明正文匹配', releaseDate].filter(Boolean).join(' · '));
+        }
+        resultsBox.classList.add('active');
+    }
+
+    input.addEventListener('focus', loadIndexes, { once: true });
+    input.addEventListener('input', () => {
+        const query = input.value.trim();
+        if (!query) {
+            resultsBox.classList.remove('active');
+            return;
+        }
+        loadIndexes().then(([pageIndex, releaseIndex]) => {
+            if (input.value.trim() !== query) return;
+            const start = performance.now();
+            const docIds = search(pageIndex, query);
+            const releaseIds = search(releaseIndex, query);
+            render(pageIndex, releaseIndex, query, docIds, releaseIds, performance.now() - start);
+        });
+    });
+})();
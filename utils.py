@@ -5,15 +5,62 @@
 
 import os
 import json
+import gzip
+import shutil
+import hashlib
+import tempfile
+import time
 import requests
 import re
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from dotenv import load_dotenv
+from http_cache import HTTPCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # 加载环境变量
 load_dotenv()
 
+# 内容寻址的资源目录：文件名即内容的sha256，内容不变的资源在所有日报间只存一份
+ASSETS_DIR = os.getenv('ASSETS_DIR', 'assets')
+
+# 外部请求的超时时间（秒）
+REQUEST_TIMEOUT = 30
+
+# 单个下载文件的大小上限（字节），防止异常响应写满磁盘
+MAX_DOWNLOAD_BYTES = int(os.getenv('MAX_DOWNLOAD_BYTES', 100 * 1024 * 1024))
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Notion版本库的本地缓存，增量同步时只查询上次同步之后编辑过的记录
+NOTION_CACHE_PATH = os.getenv('NOTION_CACHE_PATH', '.cache/notion_versions.json')
+NOTION_PAGE_SIZE = 100
+# 增量同步看不到被删除（归档）的记录，超过该天数后做一次全量同步
+NOTION_FULL_SYNC_DAYS = int(os.getenv('NOTION_FULL_SYNC_DAYS', 7))
+
+# 小于该大小的文件不生成预压缩副本（压缩收益抵不过额外的请求协商）
+PRECOMPRESS_MIN_BYTES = 1024
+
+_http_session = None
+
+def get_http_session():
+    """
+    获取共享的HTTP会话，复用连接池中的keep-alive连接
+    Returns:
+        requests.Session: HTTP会话
+    """
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        _http_session.mount('http://', adapter)
+        _http_session.mount('https://', adapter)
+    return _http_session
+
 def create_daily_directory(date=None):
     """
     根据日期创建目录结构 ./YYYY/MM/DD
@@ -37,9 +84,82 @@ def create_daily_directory(date=None):
     print(f"✅ 创建目录: {dir_path}")
     return str(dir_path)
 
-def fetch_notion_versions():
+def get_release_window_start(today=None):
+    """
+    获取版本数据的起始日期：上个月1号
+    Args:
+        today: datetime对象，默认为今天
+    Returns:
+        datetime: 上个月1号
+    """
+    today = today or datetime.now()
+    if today.month == 1:
+        return datetime(today.year - 1, 12, 1)
+    return datetime(today.year, today.month - 1, 1)
+
+def load_notion_cache(database_id):
+    """
+    加载Notion版本库的本地缓存，数据库不一致或文件损坏时返回None
+    """
+    try:
+        with open(NOTION_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('database_id') == database_id:
+            return cache
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Notion缓存损坏，重新全量同步: {e}")
+    return None
+
+def save_notion_cache(cache):
+    """原子写入Notion版本库的本地缓存"""
+    os.makedirs(os.path.dirname(NOTION_CACHE_PATH) or '.', exist_ok=True)
+    tmp_path = f"{NOTION_CACHE_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp_path, NOTION_CACHE_PATH)
+
+def query_notion_database(session, url, headers, body):
+    """
+    查询Notion数据库并跟随has_more/next_cursor取回所有分页
+    Returns:
+        tuple: (全部记录列表, 请求次数)
+    """
+    results = []
+    cursor = None
+    calls = 0
+    
+    while True:
+        page_body = dict(body, page_size=NOTION_PAGE_SIZE)
+        if cursor:
+            page_body['start_cursor'] = cursor
+        
+        response = session.post(url, headers=headers, json=page_body, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        calls += 1
+        
+        data = response.json()
+        results.extend(data.get('results', []))
+        if not data.get('has_more') or not data.get('next_cursor'):
+            return results, calls
+        cursor = data['next_cursor']
+
+def _notion_page_date(page):
+    date_prop = page.get('properties', {}).get('Date', {})
+    return (date_prop.get('date') or {}).get('start') or ''
+
+def _notion_page_version(page):
+    title = page.get('properties', {}).get('版本号', {}).get('title') or []
+    return title[0].get('plain_text', '') if title else ''
+
+def fetch_notion_versions(session=None):
     """
     从Notion API获取版本信息
+    首次（或定期）全量同步时把日期过滤下推到查询条件，之后只查询上次同步以来编辑过的记录，
+    与本地缓存合并后再解析
+    Args:
+        session: HTTP会话，默认使用共享会话
     Returns:
         dict: 版本数据
     """
@@ -58,13 +178,58 @@ def fetch_notion_versions():
         'Authorization': f'Bearer {token}'
     }
     
-    body = {
-        "filter": {
-            "property": "版本号",
-            "title": {
-                "is_not_empty": True
+    window_start = get_release_window_start().strftime('%Y-%m-%d')
+    now = datetime.now(timezone.utc)
+    cache = load_notion_cache(database_id)
+    
+    incremental = False
+    if cache and cache.get('last_sync') and cache.get('last_full_sync'):
+        last_full_sync = datetime.fromisoformat(cache['last_full_sync'])
+        incremental = now - last_full_sync < timedelta(days=NOTION_FULL_SYNC_DAYS)
+    
+    title_not_empty = {
+        "property": "版本号",
+        "title": {
+            "is_not_empty": True
+        }
+    }
+    
+    if incremental:
+        # 只取上次同步之后编辑过、有版本号的记录，不加日期条件，以便发现日期被改到窗口外的记录
+        edited_filter = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {
+                "on_or_after": cache['last_sync']
             }
-        },
+        }
+        query_filter = {"and": [edited_filter, title_not_empty]}
+        # 编辑后版本号被清空的记录不会出现在上面的结果中，单独查询后从缓存中删除
+        untitled_filter = {
+            "and": [
+                edited_filter,
+                {
+                    "property": "版本号",
+                    "title": {
+                        "is_empty": True
+                    }
+                }
+            ]
+        }
+    else:
+        query_filter = {
+            "and": [
+                title_not_empty,
+                {
+                    "property": "Date",
+                    "date": {
+                        "on_or_after": window_start
+                    }
+                }
+            ]
+        }
+    
+    body = {
+        "filter": query_filter,
         "sorts": [
             {
                 "property": "Date",
@@ -74,17 +239,43 @@ def fetch_notion_versions():
     }
     
     try:
-        print("🔄 正在从Notion获取版本信息...")
-        response = requests.post(url, headers=headers, json=body)
-        response.raise_for_status()
-        
-        data = response.json()
-        print(f"✅ 成功获取 {len(data.get('results', []))} 条版本记录")
-        return parse_notion_data(data)
-        
+        print(f"🔄 正在从Notion获取版本信息（{'增量' if incremental else '全量'}同步）...")
+        session = session or get_http_session()
+        results, calls = query_notion_database(session, url, headers, body)
+        untitled = []
+        if incremental:
+            untitled, untitled_calls = query_notion_database(session, url, headers, dict(body, filter=untitled_filter))
+            calls += untitled_calls
+        print(f"✅ 成功获取 {len(results)} 条版本记录（{calls} 次请求）")
     except requests.exceptions.RequestException as e:
         print(f"❌ Notion API请求失败: {e}")
         return None
+    
+    pages = dict(cache['pages']) if incremental else {}
+    for page in untitled:
+        pages.pop(page.get('id'), None)
+    for page in results:
+        if page.get('archived') or page.get('in_trash'):
+            pages.pop(page.get('id'), None)
+        else:
+            pages[page.get('id')] = page
+    
+    # 窗口之外和没有版本号的记录不再需要，与全量同步的结果保持一致，缓存大小只与窗口内的版本数有关
+    pages = {
+        page_id: page for page_id, page in pages.items()
+        if _notion_page_date(page) >= window_start and _notion_page_version(page)
+    }
+    
+    save_notion_cache({
+        'database_id': database_id,
+        # 回退一分钟，覆盖Notion按分钟记录的last_edited_time
+        'last_sync': (now - timedelta(minutes=1)).isoformat(timespec='seconds'),
+        'last_full_sync': cache['last_full_sync'] if incremental else now.isoformat(timespec='seconds'),
+        'pages': pages
+    })
+    
+    sorted_pages = sorted(pages.values(), key=_notion_page_date, reverse=True)
+    return parse_notion_data({'results': sorted_pages})
 
 def parse_notion_data(notion_data):
     """
@@ -97,11 +288,7 @@ def parse_notion_data(notion_data):
     releases = []
     
     # 计算上个月1号的日期
-    today = datetime.now()
-    if today.month == 1:
-        last_month_first = datetime(today.year - 1, 12, 1)
-    else:
-        last_month_first = datetime(today.year, today.month - 1, 1)
+    last_month_first = get_release_window_start()
     
     print(f"📅 数据过滤范围: {last_month_first.strftime('%Y-%m-%d')} 至今")
     
@@ -160,30 +347,98 @@ def parse_notion_data(notion_data):
     print(f"✅ 过滤后保留 {len(releases)} 条版本记录")
     return {"releases": releases}
 
-def download_external_resource(url, local_path):
+def stream_download(response, local_path, max_bytes=MAX_DOWNLOAD_BYTES, expected_sha256=None):
+    """
+    把以stream=True发起的响应分块写入同目录的临时文件，校验通过后原子重命名到目标路径，
+    内存占用与文件大小无关，传输失败也不会在目标位置留下不完整的文件
+    Args:
+        response: requests响应对象（stream=True）
+        local_path: 目标路径
+        max_bytes: 大小上限，None表示不限制
+        expected_sha256: 期望的sha256，提供时校验
+    Returns:
+        tuple: (sha256十六进制字符串, 文件大小)
+    Raises:
+        ValueError: 超过大小上限或校验和不一致
+        requests.exceptions.RequestException: 传输失败
+    """
+    content_length = response.headers.get('Content-Length')
+    if max_bytes and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ValueError(f"文件大小 {content_length} 超过上限 {max_bytes}")
+    
+    target_dir = os.path.dirname(local_path) or '.'
+    os.makedirs(target_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(local_path)}.", suffix='.part', dir=target_dir)
+    
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ValueError(f"文件大小超过上限 {max_bytes}")
+                sha256.update(chunk)
+                f.write(chunk)
+        
+        digest = sha256.hexdigest()
+        if expected_sha256 and digest != expected_sha256.lower():
+            raise ValueError(f"校验和不一致: 期望 {expected_sha256}，实际 {digest}")
+        
+        # mkstemp创建的文件权限为0600，改为普通文件权限以便静态站点读取
+        os.chmod(tmp_path, 0o644)
+        # 替换而不是改写目标文件，目标即使是缓存副本的硬链接也不受影响
+        os.replace(tmp_path, local_path)
+        return digest, size
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def download_external_resource(url, local_path, session=None, cache=None):
     """
     下载外部资源到本地
     Args:
         url: 资源URL
         local_path: 本地保存路径
+        session: HTTP会话，默认使用共享会话
+        cache: HTTPCache，提供时发送条件请求，内容未变化时复用缓存副本
     Returns:
         bool: 是否下载成功
     """
     try:
         print(f"🔄 正在下载: {url}")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # 确保目录存在
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        
-        with open(local_path, 'wb') as f:
-            f.write(response.content)
+        # 第一次按缓存发送条件请求；304但缓存副本已丢失时，不带条件请求头重试一次
+        for conditional in (True, False):
+            headers = cache.conditional_headers(url) if cache and conditional else {}
+            with (session or get_http_session()).get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+                if response.status_code == 304:
+                    if cache and cache.link_to(url, local_path):
+                        saved = cache.record_not_modified(url)
+                        print(f"♻️ 内容未变化，复用缓存({saved} 字节): {local_path}")
+                        return True
+                    if cache:
+                        cache.forget(url)
+                    if conditional and headers:
+                        print(f"⚠️ 缓存副本已丢失，重新完整下载: {url}")
+                        continue
+                    print(f"❌ 下载失败 {url}: 服务器返回304，但没有可复用的缓存副本")
+                    return False
+                response.raise_for_status()
+                if response.status_code != 200:
+                    # 只保存完整的200响应，其他状态码的响应体不能当作资源内容
+                    print(f"❌ 下载失败 {url}: 意外的状态码 {response.status_code}")
+                    return False
+                
+                sha256, size = stream_download(response, local_path)
+                if cache:
+                    cache.store_file(url, local_path, sha256, size, response.headers)
+            break
         
-        print(f"✅ 下载完成: {local_path}")
+        print(f"✅ 下载完成: {local_path} ({size} 字节)")
         return True
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError, OSError) as e:
         print(f"❌ 下载失败 {url}: {e}")
         return False
 
@@ -221,48 +476,193 @@ def save_daily_data(data, filename, date=None):
     print(f"✅ 数据已保存: {file_path}")
     return file_path
 
-def download_bug_resources(daily_dir):
+def compress_json(data):
     """
-    下载Bug相关的图片资源到当日目录
+    把数据序列化为紧凑JSON并gzip压缩
+    mtime固定为0，内容不变时压缩结果逐字节相同
+    Returns:
+        bytes: 压缩后的数据
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+def write_bytes_atomic(path, data):
+    """
+    先写同目录临时文件再原子替换，读取方不会看到写了一半的文件
     Args:
+        path: 目标路径
+        data: 文件内容（bytes）
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_precompressed(path, data, min_size=PRECOMPRESS_MIN_BYTES):
+    """
+    写入文件并生成.gz（以及安装了brotli时的.br）预压缩副本，供静态托管直接返回
+    文件小于min_size时不生成副本，并删除旧的副本，避免与新内容不一致
+    Args:
+        path: 目标路径
+        data: 文件内容（bytes）
+        min_size: 生成压缩副本的最小字节数
+    Returns:
+        dict: 各文件的字节数 {'raw': ..., 'gz': ..., 'br': ...}，未生成的副本不出现
+    """
+    write_bytes_atomic(path, data)
+    sizes = {'raw': len(data)}
+
+    compressors = {
+        'gz': lambda payload: gzip.compress(payload, compresslevel=9, mtime=0),
+        'br': (lambda payload: brotli.compress(payload, quality=11)) if brotli else None
+    }
+    for suffix, compress in compressors.items():
+        sibling_path = f"{path}.{suffix}"
+        if compress and len(data) >= min_size:
+            compressed = compress(data)
+            write_bytes_atomic(sibling_path, compressed)
+            sizes[suffix] = len(compressed)
+        elif os.path.exists(sibling_path):
+            os.remove(sibling_path)
+
+    return sizes
+
+def precompressed_suffixes():
+    """write_precompressed会生成的副本扩展名，未安装brotli时只有gz"""
+    return ['gz', 'br'] if brotli else ['gz']
+
+def precompressed_siblings_fresh(path, size, min_size=PRECOMPRESS_MIN_BYTES):
+    """
+    判断文件的预压缩副本是否与write_precompressed的结果一致：
+    大于等于min_size时每个副本都存在且不旧于原文件，小于时不应有任何副本
+    Args:
+        path: 文件路径
+        size: 文件字节数
+        min_size: 生成压缩副本的最小字节数
+    Returns:
+        bool: 副本是否已是最新
+    """
+    if size < min_size:
+        return not any(os.path.exists(f"{path}.{suffix}") for suffix in ('gz', 'br'))
+    mtime = os.path.getmtime(path)
+    for suffix in precompressed_suffixes():
+        sibling_path = f"{path}.{suffix}"
+        if not os.path.exists(sibling_path) or os.path.getmtime(sibling_path) < mtime:
+            return False
+    return True
+
+def store_asset_bytes(data, extension):
+    """
+    把内容写入内容寻址的资源目录 assets/<sha256>.<extension>
+    Args:
+        data: 文件内容（bytes）
+        extension: 扩展名，例如 png、json、json.gz
+    Returns:
+        str: 资源路径（相对仓库根目录）
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    asset_path = os.path.join(ASSETS_DIR, f"{digest}.{extension}")
+    
+    if os.path.exists(asset_path):
+        print(f"♻️ 复用已有资源: {asset_path}")
+        return asset_path
+    
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    tmp_path = f"{asset_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, asset_path)
+    
+    print(f"✅ 新增资源: {asset_path}")
+    return asset_path
+
+def store_asset_file(file_path, extension=None):
+    """
+    把已下载的文件移入内容寻址的资源目录，原文件会被删除
+    Args:
+        file_path: 文件路径
+        extension: 扩展名，默认取原文件扩展名
+    Returns:
+        str: 资源路径（相对仓库根目录）
+    """
+    if extension is None:
+        extension = os.path.splitext(file_path)[1].lstrip('.')
+    
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    asset_path = os.path.join(ASSETS_DIR, f"{sha256.hexdigest()}.{extension}")
+    
+    if os.path.exists(asset_path):
+        os.remove(file_path)
+        print(f"♻️ 复用已有资源: {asset_path}")
+    else:
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        shutil.move(file_path, asset_path)
+        print(f"✅ 新增资源: {asset_path}")
+    
+    return asset_path
+
+def save_asset_manifest(manifest, daily_dir):
+    """
+    保存当日报告引用的资源清单 assets.json
+    Args:
+        manifest: {资源名称: 资源路径}
         daily_dir: 当日目录路径
     Returns:
-        dict: 本地图片路径
+        str: 清单文件路径
     """
-    images_dir = os.path.join(daily_dir, "images")
-    os.makedirs(images_dir, exist_ok=True)
+    manifest_path = os.path.join(daily_dir, 'assets.json')
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
     
-    # 图片URL配置
-    image_urls = {
+    print(f"✅ 资源清单已保存: {manifest_path}")
+    return manifest_path
+
+def get_bug_image_urls():
+    """
+    获取Bug图表的URL配置
+    Returns:
+        dict: {图表名称: URL}，未配置的URL为None
+    """
+    return {
         'priority_chart': os.getenv('PRIORITY_CHART_URL'),
         'variation_chart': os.getenv('BUG_VARIATION_CHART_URL'),
         'modules_chart': os.getenv('MODULES_CHART_URL'),
         'priority_history_chart': os.getenv('PRIORITY_HISTORY_CHART_URL'),
         'weekly_analysis_chart': os.getenv('WEEKLY_ANALYSIS_CHART_URL')
     }
+
+def download_bug_image(key, url, images_dir, session=None, cache=None):
+    """
+    下载单张Bug图表，并移入内容寻址的资源目录
+    Args:
+        key: 图表名称
+        url: 图表URL
+        images_dir: 临时下载目录
+        session: HTTP会话
+        cache: HTTPCache
+    Returns:
+        str: 图片资源路径，下载失败时返回原URL
+    """
+    local_path = os.path.join(images_dir, f"{key}.png")
+    if download_external_resource(url, local_path, session, cache):
+        print(f"✅ 图片下载成功: {key}")
+        return store_asset_file(local_path, 'png')
     
-    local_paths = {}
-    
-    for key, url in image_urls.items():
-        if url:
-            local_path = os.path.join(images_dir, f"{key}.png")
-            if download_external_resource(url, local_path):
-                local_paths[key] = local_path
-                print(f"✅ 图片下载成功: {key}")
-            else:
-                # 如果下载失败，使用原URL
-                local_paths[key] = url
-                print(f"⚠️ 图片下载失败，使用原URL: {key}")
-        else:
-            print(f"⚠️ 未配置图片URL: {key}")
-    
-    return local_paths
+    # 如果下载失败，使用原URL
+    print(f"⚠️ 图片下载失败，使用原URL: {key}")
+    return url
 
-def download_bug_data(daily_dir):
+def download_bug_data(daily_dir, session=None, cache=None):
     """
     下载Bug数据文件到当日目录
     Args:
         daily_dir: 当日目录路径
+        session: HTTP会话，默认使用共享会话
+        cache: HTTPCache
     Returns:
         str: 本地数据文件路径，如果下载失败返回None
     """
@@ -272,10 +672,72 @@ def download_bug_data(daily_dir):
     
     local_path = os.path.join(daily_dir, "bug_data.md")
     
-    if download_external_resource(bug_data_url, local_path):
+    if download_external_resource(bug_data_url, local_path, session, cache):
         return local_path
     return None
 
+def _timed_call(func, *args):
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+        return result, time.perf_counter() - start, None
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+
+def fetch_report_resources(daily_dir, max_workers=None):
+    """
+    并发获取报告所需的全部外部资源：Notion版本信息、Bug数据markdown和所有图表，
+    所有请求同时发出并共享同一个连接池，文件下载经过持久化的条件请求缓存
+    Args:
+        daily_dir: 当日目录路径
+        max_workers: 并发数，默认等于请求数
+    Returns:
+        tuple: (版本数据或None, 图片资源路径dict, Bug数据文件路径或None)
+    """
+    session = get_http_session()
+    cache = HTTPCache()
+    images_dir = os.path.join(daily_dir, "images")
+    os.makedirs(images_dir, exist_ok=True)
+    
+    image_urls = {key: url for key, url in get_bug_image_urls().items() if url}
+    for key, url in get_bug_image_urls().items():
+        if not url:
+            print(f"⚠️ 未配置图片URL: {key}")
+    
+    tasks = {
+        'notion_versions': (fetch_notion_versions, session),
+        'bug_data': (download_bug_data, daily_dir, session, cache),
+    }
+    for key, url in image_urls.items():
+        tasks[key] = (download_bug_image, key, url, images_dir, session, cache)
+    
+    stage_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as executor:
+        futures = {name: executor.submit(_timed_call, *task) for name, task in tasks.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    stage_time = time.perf_counter() - stage_start
+    
+    print(f"\n⏱️ 外部资源获取耗时（并发总计 {stage_time:.2f}s）:")
+    for name, (result, elapsed, error) in sorted(results.items(), key=lambda item: -item[1][1]):
+        if error:
+            print(f"  - {name}: {elapsed:.2f}s ❌ {error}")
+        else:
+            print(f"  - {name}: {elapsed:.2f}s {'✅' if result else '⚠️'}")
+    
+    cache.save()
+    cache.report()
+    
+    # 图片都已移入资源目录，删除空的当日图片目录
+    if not os.listdir(images_dir):
+        os.rmdir(images_dir)
+    
+    image_paths = {}
+    for key, url in image_urls.items():
+        result, _, error = results[key]
+        image_paths[key] = url if error else result
+    
+    return results['notion_versions'][0], image_paths, results['bug_data'][0]
+
 def parse_bug_data(markdown_content):
     """
     解析Bug数据markdown文件，提取统计信息
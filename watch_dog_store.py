@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+监控历史的列式存储：把config/watch_dog_data下的JSON转换为可内存映射的定长数组
+
+每个监控对象一个目录 <store_dir>/<objectId>/:
+    meta.json          对象信息、状态/检查方式/详情字典表、源文件指纹和读取游标
+    timestamps.i64     int64 epoch秒
+    status.u8          uint8 状态编码（statuses表下标）
+    check_method.u8    uint8 检查方式编码（check_methods表下标）
+    details.u32        uint32 详情编码（details表下标）
+
+用法:
+    python watch_dog_store.py [json_dir] [store_dir]
+"""
+
+import os
+import re
+import sys
+import shutil
+import json
+import mmap
+from array import array
+from datetime import datetime, timezone
+
+DEFAULT_JSON_DIR = "config/watch_dog_data"
+DEFAULT_STORE_DIR = "config/watch_dog_store"
+STORE_FORMAT_VERSION = 1
+
+# 列名 -> (文件名, array typecode)
+COLUMNS = {
+    'timestamps': ('timestamps.i64', 'q'),
+    'status_codes': ('status.u8', 'B'),
+    'check_method_codes': ('check_method.u8', 'B'),
+    'details_codes': ('details.u32', 'I'),
+}
+
+# 编码列 -> (meta中的字典表, 记录字段)
+CODE_TABLES = {
+    'status_codes': ('statuses', 'status'),
+    'check_method_codes': ('check_methods', 'checkMethod'),
+    'details_codes': ('details', 'details'),
+}
+
+# 监控JSON中history数组的起点；history是最后一个字段，新记录追加在数组末尾
+HISTORY_ARRAY_PATTERN = re.compile(rb'"history"\s*:\s*\[')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+# 读取文件头（history之前的对象信息）的最大字节数
+HEADER_MAX_BYTES = 64 * 1024
+# 游标位置之前、以及history开头用于确认文件只是追加了记录的字节数
+CURSOR_CHECK_BYTES = 64
+
+
+def parse_timestamp_seconds(timestamp):
+    """把ISO时间戳解析为epoch秒，解析失败返回None"""
+    try:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def format_timestamp_seconds(seconds):
+    """把epoch秒格式化为与源数据一致的UTC ISO时间戳"""
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _intern(table, lookup, value, limit, table_name):
+    code = lookup.get(value)
+    if code is None:
+        # 编码写入定长列之前检查字典表大小，超出范围时给出明确的错误
+        if len(table) >= limit:
+            raise ValueError(f"{table_name}超过{limit}种，无法用定长列编码: {value!r}")
+        code = lookup[value] = len(table)
+        table.append(value)
+    return code
+
+
+def _decode_appended_records(text):
+    """
+    解析history数组中游标之后的文本：若干条以逗号分隔的记录，然后是数组和对象的结束符
+    Returns:
+        tuple: (记录列表, 最后一条记录结束的位置)，格式不符时返回None
+    """
+    decoder = json.JSONDecoder()
+    records = []
+    pos = last_end = 0
+    while True:
+        pos = WHITESPACE_PATTERN.match(text, pos).end()
+        if pos >= len(text):
+            return None
+        if text[pos] == ']':
+            break
+        if text[pos] == ',':
+            pos = WHITESPACE_PATTERN.match(text, pos + 1).end()
+        try:
+            record, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            return None
+        records.append(record)
+        last_end = pos
+
+    if text[pos + 1:].strip() != '}':
+        return None
+    return records, last_end
+
+
+def _read_appended(f, cursor):
+    """
+    按游标读取追加的记录：校验history开头和游标之前的字节未变、记录数与文件头的totalRecords一致，
+    再解析游标之后的文本。删除了最早的记录再追加同样多的新记录时，开头的字节或记录数会变化
+    Returns:
+        tuple: (数据, 新游标)，文件不是单纯追加时返回None
+    """
+    if 'head' not in cursor or 'records' not in cursor:
+        return None
+    head = f.read(HEADER_MAX_BYTES)
+    match = HISTORY_ARRAY_PATTERN.search(head)
+    if not match:
+        return None
+    try:
+        # history之前的部分补上右括号即为对象信息
+        data = json.loads(head[:match.start()].rstrip().rstrip(b',') + b'}')
+    except ValueError:
+        return None
+
+    history_head = bytes.fromhex(cursor['head'])
+    f.seek(match.end())
+    if f.read(len(history_head)) != history_head:
+        return None
+
+    records_end = match.end() + cursor['offset']
+    check = bytes.fromhex(cursor['check'])
+    f.seek(records_end - len(check))
+    if f.read(len(check)) != check:
+        return None
+    try:
+        text = f.read().decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    decoded = _decode_appended_records(text)
+    if decoded is None:
+        return None
+
+    records, last_end = decoded
+    record_count = cursor['records'] + len(records)
+    total_records = data.get('totalRecords')
+    if isinstance(total_records, int) and total_records != record_count:
+        return None
+
+    data['history'] = records
+    appended = text[:last_end].encode('utf-8')
+    new_cursor = {
+        'offset': cursor['offset'] + len(appended),
+        'check': (check + appended)[-CURSOR_CHECK_BYTES:].hex(),
+        # 上次的开头不足CURSOR_CHECK_BYTES时说明history很短，开头之后紧接着就是追加的内容
+        'head': (history_head + appended)[:CURSOR_CHECK_BYTES].hex()
+        if len(history_head) < CURSOR_CHECK_BYTES else cursor['head'],
+        'records': record_count
+    }
+    return data, new_cursor
+
+
+def _full_read_cursor(raw, data):
+    """完整读取后计算游标：history之后只有对象结束符时才支持增量读取"""
+    if not data or next(reversed(data)) != 'history':
+        return None
+    match = HISTORY_ARRAY_PATTERN.search(raw, 0, HEADER_MAX_BYTES)
+    body = raw.rstrip()
+    if not match or not body.endswith(b'}'):
+        return None
+    body = body[:-1].rstrip()
+    if not body.endswith(b']'):
+        return None
+    records_end = max(len(body[:-1].rstrip()), match.end())
+    return {
+        'offset': records_end - match.end(),
+        'check': raw[max(match.end(), records_end - CURSOR_CHECK_BYTES):records_end].hex(),
+        'head': raw[match.end():min(records_end, match.end() + CURSOR_CHECK_BYTES)].hex(),
+        'records': len(data['history'])
+    }
+
+
+def read_watch_dog_json(json_path, cursor=None):
+    """
+    读取监控JSON文件。传入上次的游标且文件只在history末尾追加了记录时，
+    只读取文件头和游标之后的字节，history中只包含新记录
+    Args:
+        json_path: 监控JSON文件路径
+        cursor: 上次读取返回的游标，None时完整读取
+    Returns:
+        tuple: (数据, 新游标（文件格式不支持增量读取时为None）, 是否为增量读取)
+    Raises:
+        ValueError: 完整读取时JSON格式错误
+    """
+    with open(json_path, 'rb') as f:
+        if cursor:
+            result = _read_appended(f, cursor)
+            if result is not None:
+                return result[0], result[1], True
+            f.seek(0)
+        raw = f.read()
+
+    data = json.loads(raw)
+    return data, _full_read_cursor(raw, data), False
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _encode_records(records, meta, json_path):
+    """
+    把记录编码为各列的新数组，meta中的字典表、记录数和最后时间戳原地更新
+    """
+    columns = {name: array(typecode) for name, (_, typecode) in COLUMNS.items()}
+    lookups = {table: {value: code for code, value in enumerate(meta[table])} for table, _ in CODE_TABLES.values()}
+    last_timestamp = meta.get('last_timestamp')
+
+    for record in records:
+        seconds = parse_timestamp_seconds(record.get('timestamp'))
+        if seconds is None:
+            print(f"⚠️ 解析时间戳失败: {record.get('timestamp')}")
+            continue
+        codes = {
+            name: _intern(meta[table], lookups[table], record.get(field, ''),
+                          1 << (8 * columns[name].itemsize), f"{json_path} 的{table}")
+            for name, (table, field) in CODE_TABLES.items()
+        }
+        columns['timestamps'].append(seconds)
+        for name, code in codes.items():
+            columns[name].append(code)
+
+        # 记录按时间追加时可以直接二分查找时间窗口
+        if last_timestamp is not None and seconds < last_timestamp:
+            meta['sorted'] = False
+        last_timestamp = seconds if last_timestamp is None else max(last_timestamp, seconds)
+
+    meta['record_count'] += len(columns['timestamps'])
+    meta['last_timestamp'] = last_timestamp
+    return columns
+
+
+def _append_column(path, data, keep_bytes):
+    # 先截掉上次追加中断时残留在meta记录数之后的字节
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+        f.truncate(keep_bytes)
+        f.seek(keep_bytes)
+        f.write(data)
+
+
+def convert_watch_dog_json(json_path, store_dir=DEFAULT_STORE_DIR, meta=None):
+    """
+    把单个监控JSON文件转换为列式存储
+    传入已有的meta且源文件只在history末尾追加了记录时，只解析新记录并追加到各列
+    Args:
+        json_path: config/watch_dog_data下的JSON文件路径
+        store_dir: 列式存储根目录
+        meta: 该文件已有的meta.json内容
+    Returns:
+        str: 转换后的对象目录，无objectId时返回None
+    """
+    source_stat = os.stat(json_path)
+    cursor = None
+    if meta and meta.get('format_version') == STORE_FORMAT_VERSION and meta.get('byteorder') == sys.byteorder:
+        cursor = meta.get('source', {}).get('cursor')
+
+    data, new_cursor, appended = read_watch_dog_json(json_path, cursor)
+    if appended and data.get('objectId') != meta['objectId']:
+        data, new_cursor, appended = read_watch_dog_json(json_path)
+
+    object_id = data.get('objectId')
+    if not object_id:
+        print(f"⚠️ 监控数据缺少objectId，跳过: {json_path}")
+        return None
+
+    if appended:
+        previous_count = meta['record_count']
+    else:
+        meta = {'statuses': [], 'check_methods': [], 'details': [], 'record_count': 0,
+                'sorted': True, 'last_timestamp': None}
+        previous_count = 0
+
+    columns = _encode_records(data.get('history', []), meta, json_path)
+
+    object_dir = os.path.join(store_dir, object_id)
+    os.makedirs(object_dir, exist_ok=True)
+
+    for name, (filename, _) in COLUMNS.items():
+        path = os.path.join(object_dir, filename)
+        if appended:
+            _append_column(path, columns[name].tobytes(), previous_count * columns[name].itemsize)
+        else:
+            _write_atomic(path, columns[name].tobytes())
+
+    meta.update({
+        'format_version': STORE_FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'objectId': object_id,
+        'objectName': data.get('objectName', object_id),
+        'lastUpdated': data.get('lastUpdated'),
+        'totalRecords': data.get('totalRecords'),
+        'source': {
+            'path': json_path,
+            'size': source_stat.st_size,
+            'mtime': source_stat.st_mtime,
+            'cursor': new_cursor
+        }
+    })
+    # meta.json最后写入，作为整个对象目录转换完成的标志；各列只有前record_count条有效
+    _write_atomic(os.path.join(object_dir, 'meta.json'),
+                  json.dumps(meta, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    return object_dir
+
+
+def _is_store_fresh(json_path, meta):
+    if not meta or meta.get('format_version') != STORE_FORMAT_VERSION:
+        return False
+    source_stat = os.stat(json_path)
+    source = meta.get('source', {})
+    return source.get('size') == source_stat.st_size and source.get('mtime') == source_stat.st_mtime
+
+
+def _read_store_metas(store_dir):
+    metas = {}
+    if not os.path.isdir(store_dir):
+        return metas
+    for entry in os.scandir(store_dir):
+        meta_path = os.path.join(entry.path, 'meta.json')
+        if entry.is_dir() and os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                metas[os.path.normpath(meta['source']['path'])] = meta
+            except (OSError, KeyError, json.JSONDecodeError):
+                continue
+    return metas
+
+
+def sync_watch_dog_store(json_dir=DEFAULT_JSON_DIR, store_dir=DEFAULT_STORE_DIR):
+    """
+    把有变化的监控JSON文件同步到列式存储（按源文件大小和修改时间判断），只追加了记录的文件只读取新记录
+    Args:
+        json_dir: 监控JSON目录
+        store_dir: 列式存储根目录
+    Returns:
+        int: 本次转换的文件数
+    """
+    if not os.path.exists(json_dir):
+        print(f"⚠️ 监控数据目录不存在: {json_dir}")
+        return 0
+
+    metas = _read_store_metas(store_dir)
+    converted = 0
+    for filename in sorted(os.listdir(json_dir)):
+        if not filename.endswith('.json'):
+            continue
+        json_path = os.path.join(json_dir, filename)
+        meta = metas.get(os.path.normpath(json_path))
+        if _is_store_fresh(json_path, meta):
+            continue
+        try:
+            object_dir = convert_watch_dog_json(json_path, store_dir, meta)
+        except (OSError, ValueError) as e:
+            # 包括JSON格式错误和字典表超出定长列范围，只跳过这一个文件
+            print(f"❌ 转换监控数据失败 {json_path}: {e}")
+            continue
+        if object_dir:
+            converted += 1
+            print(f"✅ 转换监控数据: {json_path}")
+
+    # 源文件已删除的监控对象不再出现在报告中
+    for source_path, meta in metas.items():
+        if os.path.dirname(source_path) == os.path.normpath(json_dir) and not os.path.exists(source_path):
+            shutil.rmtree(os.path.join(store_dir, meta['objectId']), ignore_errors=True)
+            print(f"🗑️ 移除已删除的监控对象: {meta.get('objectName', meta['objectId'])}")
+
+    return converted
+
+
+class WatchDogColumns:
+    """
+    单个监控对象的列式历史数据，各列是指向内存映射文件的memoryview，不复制数据
+    """
+    def __init__(self, object_dir):
+        with open(os.path.join(object_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if meta.get('format_version') != STORE_FORMAT_VERSION:
+            raise ValueError(f"不支持的列式存储版本: {object_dir}")
+
+        self.object_id = meta['objectId']
+        self.object_name = meta.get('objectName', self.object_id)
+        self.last_updated = meta.get('lastUpdated')
+        self.total_records = meta.get('totalRecords')
+        self.statuses = meta['statuses']
+        self.check_methods = meta['check_methods']
+        self.details = meta['details']
+        self.record_count = meta['record_count']
+        # 旧版本的meta没有sorted标记，按未排序处理
+        self.sorted = meta.get('sorted', False)
+        self._maps = []
+
+        swap = meta.get('byteorder', sys.byteorder) != sys.byteorder
+        for name, (filename, typecode) in COLUMNS.items():
+            setattr(self, name, self._map_column(os.path.join(object_dir, filename), typecode, swap))
+
+    def _map_column(self, path, typecode, swap):
+        if swap:
+            # 字节序不一致时无法直接映射，退化为读入内存后转换
+            values = array(typecode)
+            with open(path, 'rb') as f:
+                values.frombytes(f.read())
+            values.byteswap()
+            return memoryview(values)[:self.record_count]
+
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(array(typecode))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)[:self.record_count]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def status_code(self, status):
+        """返回状态字符串对应的编码，不存在时返回None"""
+        try:
+            return self.statuses.index(status)
+        except ValueError:
+            return None
+
+    def record(self, i):
+        """按下标还原成与源JSON一致结构的记录（时间戳精度为秒）"""
+        return {
+            'timestamp': format_timestamp_seconds(self.timestamps[i]),
+            'status': self.statuses[self.status_codes[i]],
+            'checkMethod': self.check_methods[self.check_method_codes[i]],
+            'details': self.details[self.details_codes[i]]
+        }
+
+    def as_numpy(self):
+        """以numpy数组视图返回各列（零拷贝），需要安装numpy"""
+        import numpy as np
+        return {name: np.frombuffer(getattr(self, name), dtype=np.dtype(typecode))
+                for name, (_, typecode) in COLUMNS.items()}
+
+    def close(self):
+        for name in COLUMNS:
+            getattr(self, name).release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+
+def open_watch_dog_store(store_dir=DEFAULT_STORE_DIR):
+    """
+    打开列式存储中的全部监控对象
+    Args:
+        store_dir: 列式存储根目录
+    Returns:
+        dict: key为objectId，value为WatchDogColumns
+    """
+    store = {}
+    if not os.path.isdir(store_dir):
+        print(f"⚠️ 列式存储目录不存在: {store_dir}")
+        return store
+
+    for entry in sorted(os.scandir(store_dir), key=lambda e: e.name):
+        if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'meta.json')):
+            columns = WatchDogColumns(entry.path)
+            store[columns.object_id] = columns
+
+    return store
+
+
+def main():
+    """主函数"""
+    json_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_JSON_DIR
+    store_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STORE_DIR
+    converted = sync_watch_dog_store(json_dir, store_dir)
+    print(f"✅ 列式存储已更新，转换 {converted} 个文件: {store_dir}")
+
+
+if __name__ == "__main__":
+    main()